@@ -31,6 +31,7 @@ class AryaBot(commands.Bot):
 
 async def main():
     bot = AryaBot()
-    await bot.start(TOKEN)
+    async with bot:
+        await bot.start(TOKEN)
 
 asyncio.run(main())
\ No newline at end of file
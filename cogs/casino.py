@@ -5,8 +5,9 @@ Commands:
   /wowo_work        — Kerja untuk dapat uang (cooldown 1 jam)
   /wowo_hourly      — Reward per jam
   /wowo_rob         — Coba rampok user lain (45% sukses)
+  /wowo_cooldowns   — Lihat semua timer work/hourly/rob
   /wowo_coinflip    — Coin flip bet
-  /wowo_dice        — Tebak dadu (1-6, payout 5x)
+  /wowo_dice        — Tebak dadu (1-6, payout 4.8x)
   /wowo_slots       — Slot machine
   /wowo_number      — Tebak angka (1-10, payout 9x)
   /wowo_blackjack   — Blackjack vs dealer
@@ -14,19 +15,15 @@ Commands:
 
 import asyncio
 import random
+import time
 import discord
 from discord.ext import commands
 from discord import app_commands
+from economy import aio as eco
 from economy.wowocash import (
-    claim_daily, get_profile, get_missions,
-    gacha_pull, send_transfer, buy_item, get_inventory,
-    get_leaderboard,
-    do_work, claim_hourly, do_rob,
-    casino_coinflip, casino_dice, casino_slots, casino_number,
-    blackjack_deal, blackjack_resolve,
     SHOP_ITEMS, GACHA_PULL_COST, RARITY_EMOJI, SLOT_SYMBOLS, SLOT_WEIGHTS,
     CURRENCY_ICON, DAILY_BASE, DAILY_STREAK_BONUS, DAILY_STREAK_MAX,
-    fmt_cooldown, MIN_BET, MAX_BET,
+    fmt_cooldown, MIN_BET, MAX_BET, COINFLIP_PAYOUT, DICE_PAYOUT,
 )
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
@@ -43,6 +40,12 @@ def err_embed(msg: str) -> discord.Embed:
 def result_color(won: bool) -> discord.Color:
     return discord.Color.green() if won else discord.Color.red()
 
+COOLDOWN_LABELS = {
+    "work":   "💼 Work",
+    "hourly": "⏰ Hourly",
+    "rob":    "🦹 Rob",
+}
+
 # ══════════════════════════════════════════════════════════════════════════════
 # ANIMATED GACHA VIEW
 # ══════════════════════════════════════════════════════════════════════════════
@@ -63,6 +66,8 @@ RARITY_COLORS = {
     "SSR": discord.Color.gold(),
 }
 
+MULTI_PULL_LINES = 20   # SR/SSR lines revealed one by one on a 50x/100x pull
+
 RARITY_BANNER = {
     "N":   "```\n[ N  ] Normal\n```",
     "R":   "```ansi\n\u001b[0;34m[ R  ] Rare\u001b[0m\n```",
@@ -70,6 +75,11 @@ RARITY_BANNER = {
     "SSR": "```ansi\n\u001b[0;33m[ SSR] ULTRA RARE 🌟🌟🌟\u001b[0m\n```",
 }
 
+def _odds_line(odds: dict) -> str:
+    """Exact SSR odds from the pity state the pull left behind."""
+    within = " · ".join(f"{n} pull: **{p:.1%}**" for n, p in odds["within"].items())
+    return f"{within}\nRata-rata SSR dalam ~{odds['expected']:.0f} pull lagi"
+
 class AnimatedGachaView(discord.ui.View):
     def __init__(self, cog: "Casino", user: discord.Member, count: int):
         super().__init__(timeout=60)
@@ -162,7 +172,7 @@ class BlackjackView(discord.ui.View):
             return
         if self.done:
             return
-        result = blackjack_resolve(self.state, "hit")
+        result = await eco.blackjack_resolve(self.state, "hit")
         if result["done"]:
             self.done = True
             for c in self.children: c.disabled = True
@@ -180,7 +190,7 @@ class BlackjackView(discord.ui.View):
             return
         self.done = True
         for c in self.children: c.disabled = True
-        result = blackjack_resolve(self.state, "stand")
+        result = await eco.blackjack_resolve(self.state, "stand")
         await interaction.response.edit_message(embed=_bj_embed(self.state, result), view=self)
 
     async def on_timeout(self):
@@ -245,6 +255,31 @@ async def _animate_slots(message: discord.Message, final_reels: list, bet: int,
 class Casino(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._reminders: set[tuple[int, str]] = set()   # (user_id, cooldown) to DM when ready
+        self._reminder_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        self._reminder_task = asyncio.create_task(self._reminder_loop())
+
+    async def cog_unload(self):
+        if self._reminder_task:
+            self._reminder_task.cancel()
+
+    async def _reminder_loop(self):
+        """Sleep until the next cooldown runs out (per the expiry heap), then DM whoever asked."""
+        while True:
+            result = await eco.pop_ready_cooldowns()
+            for uid, key in result["ready"]:
+                if (uid, key) not in self._reminders:
+                    continue
+                self._reminders.discard((uid, key))
+                try:
+                    user = self.bot.get_user(uid) or await self.bot.fetch_user(uid)
+                    await user.send(f"✅ {COOLDOWN_LABELS[key]} sudah siap lagi!")
+                except Exception:
+                    pass
+            nxt = result["next"]
+            await asyncio.sleep(60 if nxt is None else min(60, max(1, nxt - time.time())))
 
     # ══════════════════════════════════════════════════════════════════════════
     # ANIMATED GACHA
@@ -255,6 +290,8 @@ class Casino(commands.Cog):
     @app_commands.choices(count=[
         app_commands.Choice(name=f"1x  — {GACHA_PULL_COST:,} 💰",      value=1),
         app_commands.Choice(name=f"10x — {GACHA_PULL_COST * 10:,} 💰",  value=10),
+        app_commands.Choice(name=f"50x — {GACHA_PULL_COST * 50:,} 💰",  value=50),
+        app_commands.Choice(name=f"100x — {GACHA_PULL_COST * 100:,} 💰", value=100),
     ])
     async def gacha(self, interaction: discord.Interaction, count: int = 1):
         await interaction.response.defer()
@@ -280,7 +317,7 @@ class Casino(commands.Cog):
         await asyncio.sleep(0.3)
 
         # Phase 3: Actually pull
-        result = gacha_pull(user.id, user.display_name, count, use_ticket=use_ticket)
+        result = await eco.gacha_pull(user.id, user.display_name, count, use_ticket=use_ticket)
 
         if not result["success"]:
             await msg.edit(embed=err_embed(result["error"]))
@@ -311,6 +348,7 @@ class Casino(commands.Cog):
             )
             embed.add_field(name="Saldo",   value=f"{result['new_balance']:,} 💰",   inline=True)
             embed.add_field(name="🔮 Pity", value=f"SR:{result['pity_sr']}/50  SSR:{result['pity_ssr']}/100", inline=True)
+            embed.add_field(name="🎯 Peluang SSR", value=_odds_line(result["ssr_odds"]), inline=False)
 
             # SSR — extra celebration
             if r["rarity"] == "SSR":
@@ -320,26 +358,29 @@ class Casino(commands.Cog):
             await msg.edit(embed=embed, view=view)
 
         else:
-            # 10-pull — reveal one by one with delay
+            # Multi-pull — reveal one by one with delay. Past 10 pulls only
+            # SR/SSR are revealed; the rest shows up in the summary.
             lines         = []
             rarity_counts = {}
+            for r in results:
+                rarity_counts[r["rarity"]] = rarity_counts.get(r["rarity"], 0) + 1
+            shown = results if count <= 10 else [r for r in results if r["rarity"] in ("SR", "SSR")][:MULTI_PULL_LINES]
 
             reveal_embed = discord.Embed(
-                title = "✨ 10x Pull — Revealing...",
+                title = f"✨ {count}x Pull — Revealing...",
                 color = wowo_color(),
             )
             await msg.edit(embed=reveal_embed)
             await asyncio.sleep(0.3)
 
-            for i, r in enumerate(results):
+            for i, r in enumerate(shown):
                 emoji = RARITY_EMOJI[r["rarity"]]
                 line  = f"{emoji} **[{r['rarity']}]** {r['display']}"
                 lines.append(line)
-                rarity_counts[r["rarity"]] = rarity_counts.get(r["rarity"], 0) + 1
 
                 color = RARITY_COLORS.get(r["rarity"], wowo_color())
                 reveal_embed = discord.Embed(
-                    title       = f"✨ 10x Pull — {i+1}/10",
+                    title       = f"✨ {count}x Pull — {i+1}/{len(shown)}",
                     description = "\n".join(lines),
                     color       = color,
                 )
@@ -354,13 +395,19 @@ class Casino(commands.Cog):
             final_color = RARITY_COLORS.get(best_rarity, wowo_color())
 
             final_embed = discord.Embed(
-                title       = "🎰 10x Pull — Selesai!",
-                description = "\n".join(lines),
+                title       = f"🎰 {count}x Pull — Selesai!",
+                description = "\n".join(lines) or "Tidak ada SR/SSR kali ini.",
                 color       = final_color,
             )
             final_embed.add_field(name="📊 Ringkasan", value=summary,                                inline=True)
+            if count > 10:
+                prizes = [f"{result['coins']:,} 💰"] + [
+                    f"{SHOP_ITEMS[iid]['name']} ×{n}" for iid, n in result["items"].items()
+                ]
+                final_embed.add_field(name="🎁 Total Hadiah", value="\n".join(prizes), inline=True)
             final_embed.add_field(name="Saldo",        value=f"{result['new_balance']:,} 💰",        inline=True)
             final_embed.add_field(name="🔮 Pity",      value=f"SR:{result['pity_sr']}/50  SSR:{result['pity_ssr']}/100", inline=False)
+            final_embed.add_field(name="🎯 Peluang SSR", value=_odds_line(result["ssr_odds"]),                 inline=False)
 
             view = AnimatedGachaView(self, user, count)
             await msg.edit(embed=final_embed, view=view)
@@ -371,7 +418,7 @@ class Casino(commands.Cog):
 
     @app_commands.command(name="wowo_work", description="💼 Kerja untuk dapat WowoCash (cooldown 1 jam)")
     async def work(self, interaction: discord.Interaction):
-        result = do_work(interaction.user.id, interaction.user.display_name)
+        result = await eco.do_work(interaction.user.id, interaction.user.display_name)
         if not result["success"]:
             embed = discord.Embed(
                 title       = "😴 Kamu Kelelahan!",
@@ -402,7 +449,7 @@ class Casino(commands.Cog):
 
     @app_commands.command(name="wowo_hourly", description="⏰ Claim reward per jam")
     async def hourly(self, interaction: discord.Interaction):
-        result = claim_hourly(interaction.user.id, interaction.user.display_name)
+        result = await eco.claim_hourly(interaction.user.id, interaction.user.display_name)
         if not result["success"]:
             embed = discord.Embed(
                 title       = "⏰ Belum Waktunya!",
@@ -430,8 +477,8 @@ class Casino(commands.Cog):
     @app_commands.command(name="wowo_rob", description="🦹 Coba rampok user lain! (45% sukses)")
     @app_commands.describe(target="User yang ingin dirampok")
     async def rob(self, interaction: discord.Interaction, target: discord.Member):
-        result = do_rob(interaction.user.id, interaction.user.display_name,
-                        target.id, target.display_name)
+        result = await eco.do_rob(interaction.user.id, interaction.user.display_name,
+                                  target.id, target.display_name)
         if not result["success"]:
             await interaction.response.send_message(embed=err_embed(result["error"]), ephemeral=True)
             return
@@ -453,6 +500,23 @@ class Casino(commands.Cog):
         embed.set_footer(text="Bisa rob lagi dalam 2 jam")
         await interaction.response.send_message(embed=embed)
 
+    # ══════════════════════════════════════════════════════════════════════════
+    # COOLDOWNS
+    # ══════════════════════════════════════════════════════════════════════════
+
+    @app_commands.command(name="wowo_cooldowns", description="⏳ Lihat semua timer work/hourly/rob")
+    @app_commands.describe(ingatkan="DM aku saat timer yang berjalan sudah siap")
+    async def cooldowns(self, interaction: discord.Interaction, ingatkan: bool = False):
+        timers = await eco.get_cooldowns(interaction.user.id)
+        embed  = discord.Embed(title="⏳ Cooldown Kamu", color=wowo_color())
+        for key, secs in timers.items():
+            embed.add_field(name=COOLDOWN_LABELS[key], value=fmt_cooldown(secs), inline=True)
+        running = [key for key, secs in timers.items() if secs > 0]
+        if ingatkan and running:
+            self._reminders.update((interaction.user.id, key) for key in running)
+            embed.set_footer(text="🔔 Kamu akan di-DM saat timer siap.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     # ══════════════════════════════════════════════════════════════════════════
     # COIN FLIP
     # ══════════════════════════════════════════════════════════════════════════
@@ -476,7 +540,7 @@ class Casino(commands.Cog):
             await msg.edit(embed=embed)
             await asyncio.sleep(0.3)
 
-        result = casino_coinflip(interaction.user.id, interaction.user.display_name, bet, choice)
+        result = await eco.casino_coinflip(interaction.user.id, interaction.user.display_name, bet, choice)
         if not result["success"]:
             await msg.edit(embed=err_embed(result["error"]))
             return
@@ -496,7 +560,7 @@ class Casino(commands.Cog):
     # DICE
     # ══════════════════════════════════════════════════════════════════════════
 
-    @app_commands.command(name="wowo_dice", description="🎲 Tebak angka dadu 1-6 (payout 5x!)")
+    @app_commands.command(name="wowo_dice", description=f"🎲 Tebak angka dadu 1-6 (payout {DICE_PAYOUT:g}x!)")
     @app_commands.describe(bet="Jumlah bet", guess="Tebakan angka 1-6")
     async def dice(self, interaction: discord.Interaction, bet: int, guess: int):
         await interaction.response.defer()
@@ -510,7 +574,7 @@ class Casino(commands.Cog):
             await msg.edit(embed=embed)
             await asyncio.sleep(0.25)
 
-        result = casino_dice(interaction.user.id, interaction.user.display_name, bet, guess)
+        result = await eco.casino_dice(interaction.user.id, interaction.user.display_name, bet, guess)
         if not result["success"]:
             await msg.edit(embed=err_embed(result["error"]))
             return
@@ -525,7 +589,7 @@ class Casino(commands.Cog):
         embed.add_field(name="Hasil",  value=f"{sign}{result['delta']:,} 💰", inline=True)
         embed.add_field(name="Saldo",  value=f"{result['balance']:,} 💰",     inline=True)
         if result["won"]:
-            embed.set_footer(text="🎉 Jackpot! Payout 5x!")
+            embed.set_footer(text=f"🎉 Jackpot! Payout {DICE_PAYOUT:g}x!")
         await msg.edit(embed=embed)
 
     # ══════════════════════════════════════════════════════════════════════════
@@ -535,7 +599,7 @@ class Casino(commands.Cog):
     @app_commands.command(name="wowo_slots", description="🎰 Slot Machine! Match 3 untuk jackpot!")
     @app_commands.describe(bet="Jumlah bet")
     async def slots(self, interaction: discord.Interaction, bet: int):
-        result = casino_slots(interaction.user.id, interaction.user.display_name, bet)
+        result = await eco.casino_slots(interaction.user.id, interaction.user.display_name, bet)
         if not result["success"]:
             await interaction.response.send_message(embed=err_embed(result["error"]), ephemeral=True)
             return
@@ -566,7 +630,7 @@ class Casino(commands.Cog):
             await msg.edit(embed=embed)
             await asyncio.sleep(0.3)
 
-        result = casino_number(interaction.user.id, interaction.user.display_name, bet, guess)
+        result = await eco.casino_number(interaction.user.id, interaction.user.display_name, bet, guess)
         if not result["success"]:
             await msg.edit(embed=err_embed(result["error"]))
             return
@@ -590,7 +654,7 @@ class Casino(commands.Cog):
     @app_commands.command(name="wowo_blackjack", description="🃏 Blackjack vs Dealer! (Blackjack = 1.5x)")
     @app_commands.describe(bet="Jumlah bet")
     async def blackjack(self, interaction: discord.Interaction, bet: int):
-        result = blackjack_deal(interaction.user.id, interaction.user.display_name, bet)
+        result = await eco.blackjack_deal(interaction.user.id, interaction.user.display_name, bet)
         if not result["success"]:
             await interaction.response.send_message(embed=err_embed(result["error"]), ephemeral=True)
             return
@@ -612,15 +676,15 @@ class Casino(commands.Cog):
 
     @app_commands.command(name="wowo_casino", description="🎰 Lihat semua game casino")
     async def casino_menu(self, interaction: discord.Interaction):
-        profile = get_profile(interaction.user.id, interaction.user.display_name)
+        profile = await eco.get_fields(interaction.user.id, "balance", username=interaction.user.display_name)
         embed   = discord.Embed(
             title       = "🎰 WowoCash Casino",
             description = f"Saldo kamu: {cash(profile['balance'])}",
             color       = wowo_color(),
         )
         games = [
-            ("🪙 `/wowo_coinflip`",  f"Heads/Tails — bet, menang 2x (min {MIN_BET}, max {MAX_BET:,})"),
-            ("🎲 `/wowo_dice`",      f"Tebak dadu 1-6 — menang 5x"),
+            ("🪙 `/wowo_coinflip`",  f"Heads/Tails — bet, menang {1 + COINFLIP_PAYOUT:g}x (min {MIN_BET}, max {MAX_BET:,})"),
+            ("🎲 `/wowo_dice`",      f"Tebak dadu 1-6 — menang {DICE_PAYOUT:g}x"),
             ("🎰 `/wowo_slots`",     f"Slot Machine — match 3, jackpot 🃏🃏🃏 = 50x!"),
             ("🔢 `/wowo_number`",    f"Tebak angka 1-10 — menang 9x"),
             ("🃏 `/wowo_blackjack`", f"Blackjack vs Dealer — BJ payout 1.5x"),
@@ -634,7 +698,8 @@ class Casino(commands.Cog):
             value = (
                 "💼 `/wowo_work` — Kerja (1 jam cooldown)\n"
                 "⏰ `/wowo_hourly` — Reward tiap jam\n"
-                "🦹 `/wowo_rob` — Rampok user lain (2 jam cooldown)"
+                "🦹 `/wowo_rob` — Rampok user lain (2 jam cooldown)\n"
+                "⏳ `/wowo_cooldowns` — Lihat semua timer"
             ),
             inline=False,
         )
@@ -19,10 +19,8 @@ import random
 import discord
 from discord.ext import commands
 from discord import app_commands
-from economy.wowocash import (
-    get_user, _save_user, _add_balance, _progress_mission,
-    MIN_BET, MAX_BET,
-)
+from economy import aio as eco
+from economy.wowocash import MIN_BET, MAX_BET
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
@@ -153,10 +151,10 @@ class LobbyView(discord.ui.View):
         if len(g.players) >= MAX_PLAYERS:
             await interaction.response.send_message(f"❌ Lobby penuh! (max {MAX_PLAYERS})", ephemeral=True)
             return
-        u = get_user(interaction.user.id, interaction.user.display_name)
-        if u["balance"] < g.bet:
+        balance = await eco.get_balance(interaction.user.id, interaction.user.display_name)
+        if balance < g.bet:
             await interaction.response.send_message(
-                f"❌ WowoCash tidak cukup! Butuh {cash(g.bet)}, punya {cash(u['balance'])}.",
+                f"❌ WowoCash tidak cukup! Butuh {cash(g.bet)}, punya {cash(balance)}.",
                 ephemeral=True,
             )
             return
@@ -191,21 +189,16 @@ class LobbyView(discord.ui.View):
             await interaction.response.send_message("❌ Sudah dimulai!", ephemeral=True)
             return
 
-        # Cek saldo semua pemain
-        broke = [p.display_name for p in g.players
-                 if get_user(p.id, p.display_name)["balance"] < g.bet]
-        if broke:
+        # Cek saldo semua pemain & potong bet (semua atau tidak sama sekali)
+        buy_in = await eco.update_users({
+            (p.id, p.display_name): {"balance": (-g.bet, "rr_bet")} for p in g.players
+        })
+        if not buy_in["success"]:
             await interaction.response.send_message(
-                f"❌ Saldo tidak cukup: {', '.join(broke)}", ephemeral=True
+                f"❌ Saldo tidak cukup: {', '.join(buy_in['short'])}", ephemeral=True
             )
             return
 
-        # Potong bet
-        for p in g.players:
-            u = get_user(p.id, p.display_name)
-            u = _add_balance(u, -g.bet, "Russian Roulette bet")
-            _save_user(p.id, u)
-
         g.pot     = g.bet * len(g.players)
         g.started = True
 
@@ -309,10 +302,10 @@ class RouletteCog(commands.Cog):
                 f"❌ Bet harus antara {MIN_BET:,}–{MAX_BET:,} 💰.", ephemeral=True
             )
             return
-        u = get_user(interaction.user.id, interaction.user.display_name)
-        if u["balance"] < bet:
+        balance = await eco.get_balance(interaction.user.id, interaction.user.display_name)
+        if balance < bet:
             await interaction.response.send_message(
-                f"❌ WowoCash tidak cukup! Butuh {cash(bet)}, punya {cash(u['balance'])}.",
+                f"❌ WowoCash tidak cukup! Butuh {cash(bet)}, punya {cash(balance)}.",
                 ephemeral=True,
             )
             return
@@ -594,10 +587,7 @@ class RouletteCog(commands.Cog):
         game.ended = True
 
         if winner:
-            u = get_user(winner.id, winner.display_name)
-            u = _add_balance(u, game.pot, f"Russian Roulette menang (pot {game.pot:,})")
-            u = _progress_mission(u, "casino", 1)
-            _save_user(winner.id, u)
+            await eco.roulette_payout(winner.id, winner.display_name, game.pot)
 
             death_roll = "\n".join(
                 f"`{i+1}.` 💀 ~~{p.display_name}~~  {lives_display(0)}"
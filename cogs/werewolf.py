@@ -1,4 +1,5 @@
 import asyncio
+import random
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -7,6 +8,14 @@ from games.werewolf_game import (
     NIGHT_ACTION_TIMEOUT, DAY_DISCUSSION_TIME, VOTE_TIMEOUT
 )
 
+# Shop items (economy.wowocash.SHOP_ITEMS) a player can pick with /ww_use.
+# One of each is used up only when it takes effect.
+GAME_ITEMS = {
+    "shield":      "🛡️ Shield",
+    "double_vote": "🗳️ Double Vote",
+    "role_hint":   "📜 Role Hint",
+}
+
 # ══════════════════════════════════════════════════════════════════════════════
 # EMBED HELPERS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -55,7 +64,7 @@ class LobbyView(discord.ui.View):
             )
             embed.add_field(name="Role yang akan dipakai", value=preview, inline=False)
 
-        embed.set_footer(text="Minimal 4 pemain untuk mulai • Pastikan DM terbuka!")
+        embed.set_footer(text="Minimal 4 pemain untuk mulai • /ww_use untuk pakai item • Pastikan DM terbuka!")
         return embed
 
     @discord.ui.button(label="✋ Join", style=discord.ButtonStyle.success, custom_id="lobby_join")
@@ -270,20 +279,19 @@ class VoteView(discord.ui.View):
             return
         # Track for WowoCash missions
         try:
-            from economy.wowocash import progress_vote
-            progress_vote(voter.id, voter.display_name)
+            from economy import aio as eco
+            await eco.progress_vote(voter.id, voter.display_name)
         except Exception:
             pass
         await interaction.response.edit_message(embed=self.vote_embed(), view=self)
         await interaction.followup.send(f"🗳️ **{voter.display_name}** memvote **{target.display_name}**")
 
     def vote_embed(self) -> discord.Embed:
-        from collections import Counter
         embed     = discord.Embed(title="🗳️ Voting Berjalan", color=discord.Color.orange())
         alive_str = "\n".join(f"• {p.display_name}" for p in self.game.alive)
         embed.add_field(name="Pemain Hidup", value=alive_str, inline=True)
         if self.game.votes:
-            tally = Counter(self.game.votes.values())
+            tally = self.game.vote_counts()
             embed.add_field(
                 name  = "📊 Tally",
                 value = "\n".join(f"**{p.display_name}** — {v} vote{'s' if v>1 else ''}" for p, v in tally.most_common()),
@@ -424,6 +432,32 @@ class Werewolf(commands.Cog):
         del self.games[cid]
         await interaction.response.send_message(embed=make_embed("🗑️ Game Dibatalkan", "", discord.Color.greyple()))
 
+    # ── /ww_use ───────────────────────────────────────────────────────────────
+
+    @app_commands.command(name="ww_use", description="Pilih item toko yang ingin dipakai di game ini")
+    @app_commands.describe(item="Item yang dipakai (pilih lagi untuk batal)")
+    @app_commands.choices(item=[app_commands.Choice(name=label, value=iid) for iid, label in GAME_ITEMS.items()])
+    async def use_item(self, interaction: discord.Interaction, item: str):
+        game = self.get_game(interaction.channel_id)
+        if not game or game.phase != Phase.WAITING:
+            await interaction.response.send_message("❌ Item hanya bisa dipilih di lobby sebelum game mulai.", ephemeral=True)
+            return
+        if interaction.user not in game.players:
+            await interaction.response.send_message("❌ Join lobby dulu!", ephemeral=True)
+            return
+        from economy import aio as eco
+        inv = (await eco.get_fields(interaction.user.id, "inventory", username=interaction.user.display_name))["inventory"]
+        if item not in game.item_choices.get(interaction.user, ()) and inv.get(item, 0) <= 0:
+            await interaction.response.send_message(f"❌ Kamu tidak punya {GAME_ITEMS[item]}. Beli di `/wowo_shop`!", ephemeral=True)
+            return
+        picked = game.toggle_item(interaction.user, item)
+        chosen = ", ".join(GAME_ITEMS[iid] for iid in GAME_ITEMS if iid in game.item_choices[interaction.user]) or "tidak ada"
+        await interaction.response.send_message(
+            f"{'✅' if picked else '↩️'} {GAME_ITEMS[item]} {'dipilih' if picked else 'batal dipilih'}. "
+            f"Item untuk game ini: {chosen}.\nItem hanya terpakai saat efeknya benar-benar berlaku.",
+            ephemeral=True,
+        )
+
     # ══════════════════════════════════════════════════════════════════════════
     # START GAME
     # ══════════════════════════════════════════════════════════════════════════
@@ -455,10 +489,95 @@ class Werewolf(commands.Cog):
                     discord.Color.red(),
                 ))
 
+        try:
+            await self._arm_items(game)
+        except Exception as e:
+            # Roles are out already: play on without items rather than hang.
+            print(f"[WowoCash] Error arming werewolf items: {e}")
+            game.shields.clear()
+            game.double_votes.clear()
+
         cid               = game.channel.id
         task              = asyncio.create_task(self.game_loop(game))
         self._game_tasks[cid] = task
 
+    async def _arm_items(self, game: WerewolfGame):
+        """
+        Arm the items players picked with /ww_use and still own. Shield and
+        Double Vote cost nothing yet (see _charge_items); Role Hint takes
+        effect right away, so it is used up here.
+        """
+        from economy import aio as eco
+        picks = {p: items for p, items in game.item_choices.items() if items and p in game.players}
+        if not picks:
+            return
+        users = await eco.get_users([(p.id, p.display_name) for p in picks])
+
+        armed = {}
+        for player, items in picks.items():
+            inv = users[str(player.id)]["inventory"]
+            armed[player] = [iid for iid in GAME_ITEMS if iid in items and inv.get(iid, 0) > 0]
+
+        hints = [p for p, items in armed.items() if "role_hint" in items]
+        if hints:
+            # Fails only if a stock dropped since the read (another game
+            # starting at the same moment); nobody gets a hint then.
+            result = await eco.update_users({(p.id, p.display_name): {"items": {"role_hint": -1}} for p in hints})
+            if not result["success"]:
+                for p in hints:
+                    armed[p].remove("role_hint")
+
+        for player, items in armed.items():
+            lines = []
+            if "shield" in items:
+                game.shields.add(player)
+                lines.append("🛡️ **Shield** siap — menahan 1 serangan malam, dipakai hanya jika benar-benar menyelamatkanmu.")
+            if "double_vote" in items:
+                game.double_votes.add(player)
+                lines.append("🗳️ **Double Vote** siap — vote siangmu berikutnya dihitung 2x, dipakai saat kamu vote.")
+            if "role_hint" in items:
+                other = random.choice([p for p in game.players if p != player])
+                info  = ROLE_INFO[game.role_of(other)]
+                lines.append(f"📜 **Role Hint**: {other.display_name} adalah {info['emoji']} **{game.role_of(other).value}**.")
+            missing = [GAME_ITEMS[iid] for iid in picks[player] if iid not in items]
+            if missing:
+                lines.append(f"⚠️ Tidak dipakai (stok habis): {', '.join(missing)}")
+            await self.safe_dm(player, embed=make_embed("🎒 Item Game", "\n".join(lines), discord.Color.blurple()))
+
+    async def _charge_items(self, game: WerewolfGame):
+        """
+        Use up the items that took effect since the last call
+        (game.items_used). Never raises, so the game loop goes on: a use
+        that can't be charged is logged and the player's remaining items
+        are disarmed, so it can't happen again for free.
+        """
+        if not game.items_used:
+            return
+        used, game.items_used = game.items_used, []
+        changes = {}
+        for player, iid in used:
+            items = changes.setdefault(player, {})
+            items[iid] = items.get(iid, 0) - 1
+        try:
+            from economy import aio as eco
+            result = await eco.update_users({(p.id, p.display_name): {"items": i} for p, i in changes.items()})
+            if result["success"]:
+                return
+            # Someone's stock ran out meanwhile (used in another game); still
+            # charge everyone else.
+            unpaid = []
+            for player, items in changes.items():
+                one = await eco.update_users({(player.id, player.display_name): {"items": items}})
+                if not one["success"]:
+                    unpaid.append(player)
+        except Exception as e:
+            print(f"[WowoCash] Error charging werewolf items: {e}")
+            unpaid = list(changes)
+        for player in unpaid:
+            print(f"[WowoCash] Unpaid werewolf item use by {player.display_name} ({player.id}): {changes[player]}")
+            game.shields.discard(player)
+            game.double_votes.discard(player)
+
     # ══════════════════════════════════════════════════════════════════════════
     # GAME LOOP
     # ══════════════════════════════════════════════════════════════════════════
@@ -603,6 +722,7 @@ class Werewolf(commands.Cog):
 
         # ── Resolve ───────────────────────────────────────────────────────────
         result = game.resolve_night()
+        await self._charge_items(game)
 
         lines = []
 
@@ -631,6 +751,8 @@ class Werewolf(commands.Cog):
         # Normal kill / save
         elif result["saved"] and result["wolf_target"]:
             lines.append("✨ Seseorang diselamatkan malam ini! Tidak ada yang mati.")
+        elif result["shielded"]:
+            lines.append("🛡️ Sebuah **Shield** menahan serangan malam ini! Tidak ada yang mati.")
         elif result["killed"]:
             lines.append(f"💀 **{result['killed'].display_name}** ditemukan tewas di pagi hari!")
         else:
@@ -690,6 +812,7 @@ class Werewolf(commands.Cog):
         # ── Resolve ───────────────────────────────────────────────────────────
         eliminated = game.resolve_vote()
         game.phase = Phase.NIGHT
+        await self._charge_items(game)
 
         if eliminated:
             role = game.roles[eliminated]
@@ -780,7 +903,7 @@ class Werewolf(commands.Cog):
 
         # ── WowoCash rewards ──────────────────────────────────────────────────
         try:
-            from economy.wowocash import award_game_end
+            from economy import aio as eco
             first_dead = game.dead[0] if game.dead else None
             players_result = []
             for p in game.players:
@@ -803,7 +926,7 @@ class Werewolf(commands.Cog):
                     "is_first_blood": p == first_dead,
                 })
 
-            awards = award_game_end(players_result)
+            awards = await eco.award_game_end(players_result)
 
             reward_lines = []
             for a in sorted(awards, key=lambda x: x["awarded"], reverse=True):
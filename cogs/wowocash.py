@@ -4,11 +4,9 @@ import random
 import discord
 from discord.ext import commands
 from discord import app_commands
+from economy import aio as eco
 from economy.wowocash import (
-    claim_daily, get_profile, get_missions,
-    send_transfer, buy_item, get_inventory,
-    get_leaderboard,
-    SHOP_ITEMS,
+    SHOP_ITEMS, LEADERBOARD_KEYS,
     CURRENCY_ICON, DAILY_BASE, DAILY_STREAK_BONUS, DAILY_STREAK_MAX,
 )
 
@@ -67,7 +65,7 @@ class ShopView(discord.ui.View):
             if interaction.user.id != self.user.id:
                 await interaction.response.send_message("❌ Ini bukan shopmu!", ephemeral=True)
                 return
-            result = buy_item(interaction.user.id, interaction.user.display_name, item_id)
+            result = await eco.buy_item(interaction.user.id, interaction.user.display_name, item_id)
             if not result["success"]:
                 await interaction.response.send_message(embed=err_embed(result["error"]), ephemeral=True)
                 return
@@ -88,10 +86,10 @@ class ShopView(discord.ui.View):
             return
         self.category = interaction.data["values"][0]
         self._rebuild()
-        await interaction.response.edit_message(embed=self._shop_embed(), view=self)
+        await interaction.response.edit_message(embed=await self._shop_embed(), view=self)
 
-    def _shop_embed(self) -> discord.Embed:
-        profile = get_profile(self.user.id, self.user.display_name)
+    async def _shop_embed(self) -> discord.Embed:
+        profile = await eco.get_fields(self.user.id, "balance", "inventory", username=self.user.display_name)
         embed = discord.Embed(
             title=f"🛒 WowoCash Shop",
             description=f"Saldo kamu: {cash(profile['balance'])}",
@@ -124,7 +122,7 @@ class MissionsView(discord.ui.View):
             await interaction.response.send_message("❌ Ini bukan misimu!", ephemeral=True)
             return
         self.show_tab = "daily"
-        await interaction.response.edit_message(embed=self._build_embed(), view=self)
+        await interaction.response.edit_message(embed=await self._build_embed(), view=self)
 
     @discord.ui.button(label="📆 Mingguan", style=discord.ButtonStyle.secondary, custom_id="missions_weekly")
     async def weekly_tab(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -132,10 +130,10 @@ class MissionsView(discord.ui.View):
             await interaction.response.send_message("❌ Ini bukan misimu!", ephemeral=True)
             return
         self.show_tab = "weekly"
-        await interaction.response.edit_message(embed=self._build_embed(), view=self)
+        await interaction.response.edit_message(embed=await self._build_embed(), view=self)
 
-    def _build_embed(self) -> discord.Embed:
-        data  = get_missions(self.user.id, self.user.display_name)
+    async def _build_embed(self) -> discord.Embed:
+        data  = await eco.get_missions(self.user.id, self.user.display_name)
         mlist = data["daily"] if self.show_tab == "daily" else data["weekly"]
         title = "📅 Misi Harian" if self.show_tab == "daily" else "📆 Misi Mingguan"
 
@@ -153,19 +151,139 @@ class MissionsView(discord.ui.View):
         embed.set_footer(text="Harian reset tiap tengah malam • Mingguan reset tiap Senin")
         return embed
 
+# ══════════════════════════════════════════════════════════════════════════════
+# HISTORY VIEW
+# ══════════════════════════════════════════════════════════════════════════════
+
+HISTORY_KINDS = {
+    "all":      "📜 Semua",
+    "casino":   "🎰 Casino",
+    "transfer": "💸 Transfer",
+    "gacha":    "🎁 Gacha",
+    "mission":  "📋 Misi",
+    "income":   "💼 Pendapatan",
+    "rob":      "🦹 Rampok",
+    "shop":     "🛒 Shop",
+}
+
+class HistoryView(discord.ui.View):
+    def __init__(self, user: discord.Member, kind: str, since: str | None, until: str | None):
+        super().__init__(timeout=120)
+        self.user    = user
+        self.kind    = kind
+        self.since   = since
+        self.until   = until
+        self.cursors = [None]    # before= cursor of every page opened so far
+        self.page: dict = {}
+
+        kind_select = discord.ui.Select(
+            placeholder="Filter jenis transaksi...",
+            options=[
+                discord.SelectOption(label=label, value=key, default=key == kind)
+                for key, label in HISTORY_KINDS.items()
+            ],
+            custom_id="history_kind",
+            row=0,
+        )
+        kind_select.callback = self._on_kind
+        self.add_item(kind_select)
+
+    async def load(self) -> dict:
+        self.page = await eco.get_history(
+            self.user.id, self.user.display_name,
+            kind=None if self.kind == "all" else self.kind,
+            since=self.since, until=self.until, before=self.cursors[-1],
+        )
+        self.prev_btn.disabled = len(self.cursors) == 1
+        self.next_btn.disabled = not self.page.get("next")
+        return self.page
+
+    async def _guard(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message("❌ Ini bukan riwayatmu!", ephemeral=True)
+            return False
+        return True
+
+    async def _on_kind(self, interaction: discord.Interaction):
+        if not await self._guard(interaction):
+            return
+        self.kind    = interaction.data["values"][0]
+        self.cursors = [None]
+        for opt in self.children[0].options:
+            opt.default = opt.value == self.kind
+        await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="◀️ Baru", style=discord.ButtonStyle.secondary, custom_id="history_prev", row=1)
+    async def prev_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not await self._guard(interaction):
+            return
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+        await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Lama ▶️", style=discord.ButtonStyle.secondary, custom_id="history_next", row=1)
+    async def next_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not await self._guard(interaction):
+            return
+        if self.page.get("next"):
+            self.cursors.append(self.page["next"])
+        await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(title=f"📜 Riwayat {self.user.display_name}", color=wowo_color())
+        entries = self.page.get("entries", [])
+        if not entries:
+            embed.description = "Tidak ada transaksi."
+        else:
+            embed.description = "\n".join(
+                f"<t:{e['ts']}:d> `{'+' if e['amount'] > 0 else ''}{e['amount']:,}` {e['note']}"
+                for e in entries
+            )
+        span = ""
+        if self.since or self.until:
+            span = f" • {self.since or '…'} s/d {self.until or 'sekarang'}"
+        embed.set_footer(text=f"{HISTORY_KINDS[self.kind]} • Halaman {len(self.cursors)}{span}")
+        return embed
+
 # ══════════════════════════════════════════════════════════════════════════════
 # MAIN COG
 # ══════════════════════════════════════════════════════════════════════════════
 
+TIER_SWEEP_SECS = 3600   # how often idle users are moved to the cold tier
+
 class WowoCash(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._tier_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        await eco.load()   # economy + ledger seeding, before the first command
+        self._tier_task = asyncio.create_task(self._tier_loop())
+
+    async def cog_unload(self):
+        if self._tier_task:
+            self._tier_task.cancel()
+        await eco.flush()
+
+    async def _tier_loop(self):
+        """Every TIER_SWEEP_SECS, evict users idle past WOWO_COLD_AFTER_DAYS."""
+        while True:
+            try:
+                if await eco.evict_dormant():
+                    stats = await eco.tier_stats()
+                    print(f"[WowoCash] Cold tier: {stats['hot']} hot, {stats['cold']} cold")
+            except Exception as e:
+                print(f"[WowoCash] Cold tier sweep failed: {e}")
+            await asyncio.sleep(TIER_SWEEP_SECS)
 
     # ── /wowo_daily ───────────────────────────────────────────────────────────
 
     @app_commands.command(name="wowo_daily", description="Claim hadiah login harian")
     async def daily(self, interaction: discord.Interaction):
-        result = claim_daily(interaction.user.id, interaction.user.display_name)
+        result = await eco.claim_daily(interaction.user.id, interaction.user.display_name)
 
         if not result["success"]:
             embed = discord.Embed(
@@ -198,10 +316,12 @@ class WowoCash(commands.Cog):
     @app_commands.describe(user="User lain (opsional)")
     async def balance(self, interaction: discord.Interaction, user: discord.Member = None):
         target  = user or interaction.user
-        profile = get_profile(target.id, target.display_name)
+        profile = await eco.get_fields(target.id, "balance", "lifetime", "rank", "total_users",
+                                       username=target.display_name)
         embed = discord.Embed(title=f"{CURRENCY_ICON} Saldo {target.display_name}", color=wowo_color())
         embed.add_field(name="💰 Saldo",          value=f"{profile['balance']:,}",  inline=True)
         embed.add_field(name="📈 Total Diperoleh", value=f"{profile['lifetime']:,}", inline=True)
+        embed.add_field(name="🏅 Peringkat",       value=f"#{profile['rank']:,} dari {profile['total_users']:,}", inline=True)
         embed.set_thumbnail(url=target.display_avatar.url)
         await interaction.response.send_message(embed=embed)
 
@@ -211,7 +331,7 @@ class WowoCash(commands.Cog):
     @app_commands.describe(user="User lain (opsional)")
     async def profile_cmd(self, interaction: discord.Interaction, user: discord.Member = None):
         target  = user or interaction.user
-        profile = get_profile(target.id, target.display_name)
+        profile = await eco.get_profile(target.id, target.display_name)
         stats   = profile["stats"]
 
         embed = discord.Embed(title=f"👤 Profil {target.display_name}", color=wowo_color())
@@ -222,17 +342,18 @@ class WowoCash(commands.Cog):
         embed.add_field(name=f"{CURRENCY_ICON} Saldo",   value=f"{profile['balance']:,}",           inline=True)
         embed.add_field(name="📈 Total Earned",           value=f"{profile['lifetime']:,}",           inline=True)
         embed.add_field(name="🔥 Daily Streak",           value=f"{profile['daily']['streak']} hari", inline=True)
+        embed.add_field(name="🏅 Peringkat",              value=f"#{profile['rank']:,} dari {profile['total_users']:,}", inline=True)
         embed.add_field(name="🎮 Games Played",           value=str(stats["games_played"]),           inline=True)
         embed.add_field(name="🏆 Games Won",              value=str(stats["games_won"]),              inline=True)
         embed.add_field(name="💪 Survived",               value=str(stats["games_survived"]),         inline=True)
         embed.add_field(name="🎰 Gacha Pulls",            value=str(stats["gacha_pulls"]),            inline=True)
-        embed.add_field(name="📦 Inventory",              value=f"{len(profile['inventory'])} jenis", inline=True)
+        embed.add_field(name="📦 Inventory",              value=f"{profile['inventory_kinds']} jenis", inline=True)
         embed.add_field(
             name="📋 Misi",
             value=f"Harian: {profile['daily_done']}/{profile['missions_total_daily']} | Mingguan: {profile['weekly_done']}/{profile['missions_total_weekly']}",
             inline=False,
         )
-        txs = profile.get("transactions", [])[:5]
+        txs = profile["transactions"]
         if txs:
             tx_str = "\n".join(
                 f"`{'+'if t['amount']>0 else ''}{t['amount']:,}` {t['note']}" for t in txs
@@ -245,7 +366,7 @@ class WowoCash(commands.Cog):
     @app_commands.command(name="wowo_missions", description="Lihat misi harian & mingguan")
     async def missions_cmd(self, interaction: discord.Interaction):
         view  = MissionsView(interaction.user)
-        embed = view._build_embed()
+        embed = await view._build_embed()
         await interaction.response.send_message(embed=embed, view=view)
 
     # ── /wowo_shop ────────────────────────────────────────────────────────────
@@ -253,14 +374,14 @@ class WowoCash(commands.Cog):
     @app_commands.command(name="wowo_shop", description="Lihat dan beli item di shop")
     async def shop(self, interaction: discord.Interaction):
         view  = ShopView(self, interaction.user)
-        embed = view._shop_embed()
+        embed = await view._shop_embed()
         await interaction.response.send_message(embed=embed, view=view)
 
     # ── /wowo_inventory ───────────────────────────────────────────────────────
 
     @app_commands.command(name="wowo_inventory", description="Lihat inventaris kamu")
     async def inventory(self, interaction: discord.Interaction):
-        inv   = get_inventory(interaction.user.id, interaction.user.display_name)
+        inv   = await eco.get_inventory(interaction.user.id, interaction.user.display_name)
         embed = discord.Embed(
             title=f"🎒 Inventaris {interaction.user.display_name}",
             description=f"Saldo: {cash(inv['balance'])}",
@@ -286,7 +407,7 @@ class WowoCash(commands.Cog):
             await interaction.response.send_message(embed=err_embed("Jumlah harus lebih dari 0!"), ephemeral=True)
             return
 
-        result = send_transfer(
+        result = await eco.send_transfer(
             interaction.user.id, interaction.user.display_name,
             target.id, target.display_name,
             amount,
@@ -303,22 +424,48 @@ class WowoCash(commands.Cog):
         embed.add_field(name="Sisa Saldo",   value=f"{result['sender_balance']:,}", inline=True)
         await interaction.response.send_message(embed=embed)
 
+    # ── /wowo_history ─────────────────────────────────────────────────────────
+
+    @app_commands.command(name="wowo_history", description="Riwayat lengkap transaksi WowoCash")
+    @app_commands.describe(
+        kind="Jenis transaksi (default: semua)",
+        since="Dari tanggal, format YYYY-MM-DD (opsional)",
+        until="Sampai tanggal, format YYYY-MM-DD (opsional)",
+    )
+    @app_commands.choices(kind=[
+        app_commands.Choice(name=label, value=key) for key, label in HISTORY_KINDS.items()
+    ])
+    async def history(self, interaction: discord.Interaction, kind: str = "all",
+                      since: str = None, until: str = None):
+        view = HistoryView(interaction.user, kind, since, until)
+        page = await view.load()
+        if not page["success"]:
+            await interaction.response.send_message(embed=err_embed(page["error"]), ephemeral=True)
+            return
+        await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
+
     # ── /wowo_leaderboard ─────────────────────────────────────────────────────
 
-    @app_commands.command(name="wowo_leaderboard", description="Top 10 saldo WowoCash")
-    async def leaderboard(self, interaction: discord.Interaction):
-        lb    = get_leaderboard(10)
-        embed = discord.Embed(title=f"{CURRENCY_ICON} WowoCash Leaderboard", color=wowo_color())
+    @app_commands.command(name="wowo_leaderboard", description="Top 10 WowoCash (saldo, game, gacha, streak)")
+    @app_commands.describe(by="Urutkan berdasarkan (default: saldo)", page="Halaman (opsional, 10 per halaman)")
+    @app_commands.choices(by=[
+        app_commands.Choice(name=label, value=key) for key, label in LEADERBOARD_KEYS.items()
+    ])
+    async def leaderboard(self, interaction: discord.Interaction, by: str = "balance", page: int = 1):
+        page  = max(1, page)
+        lb    = await eco.get_leaderboard(10, offset=(page - 1) * 10, by=by)
+        me    = await eco.get_rank(interaction.user.id, interaction.user.display_name, by=by)
+        embed = discord.Embed(title=f"{CURRENCY_ICON} WowoCash Leaderboard — {LEADERBOARD_KEYS[by]}", color=wowo_color())
         if not lb:
             embed.description = "Belum ada data."
         else:
             medals = ["🥇", "🥈", "🥉"]
             lines  = [
-                f"{medals[e['rank']-1] if e['rank'] <= 3 else f'`#{e[chr(114)+(chr(97)+chr(110)+chr(107))]}`'} **{e['username']}** — {e['balance']:,} 💰"
+                f"{medals[e['rank']-1] if e['rank'] <= 3 else f'`#{e[chr(114)+(chr(97)+chr(110)+chr(107))]}`'} **{e['username']}** — {e['value']:,}"
                 for e in lb
             ]
             embed.description = "\n".join(lines)
-        embed.set_footer(text="Update realtime dari data lokal")
+        embed.set_footer(text=f"Halaman {page} • Peringkatmu: #{me['rank']:,} dari {me['total_users']:,}")
         await interaction.response.send_message(embed=embed)
 
 
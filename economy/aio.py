@@ -0,0 +1,189 @@
+"""
+WowoCash async facade
+
+Cogs await these instead of calling economy.wowocash directly:
+
+    from economy import aio as eco
+    result = await eco.claim_daily(user.id, user.display_name)
+
+Every call runs on a dedicated thread pool, so loading the economy, journal
+fsyncs and SQLite writes never stall the event loop or the gateway heartbeat.
+Calls that touch the same user are serialized by a per-user lock (taken in
+ascending id order when several users are involved); calls for different
+users run in parallel.
+"""
+
+import asyncio
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from economy import wowocash as _eco
+
+IO_WORKERS = int(os.getenv("WOWO_IO_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="wowo-io")
+
+# Entries disappear once no pending call holds the lock.
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def _lock(uid) -> asyncio.Lock:
+    key  = str(uid)
+    lock = _locks.get(key)
+    if lock is None:
+        lock = _locks[key] = asyncio.Lock()
+    return lock
+
+async def _run(uids, fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) on the executor while holding the users' locks."""
+    locks = [_lock(uid) for uid in sorted({str(u) for u in uids})]
+    for i, lock in enumerate(locks):
+        try:
+            await lock.acquire()
+        except BaseException:
+            for held in locks[:i]:
+                held.release()
+            raise
+    try:
+        fut = asyncio.get_running_loop().run_in_executor(
+            _executor, functools.partial(fn, *args, **kwargs)
+        )
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # The worker can't be interrupted; keep the users locked until it
+            # finishes so the next call never overlaps it.
+            await asyncio.wait([fut])
+            raise
+    finally:
+        for lock in locks:
+            lock.release()
+
+def _uid(member):
+    return member[0] if isinstance(member, tuple) else member
+
+# ─── Bulk ─────────────────────────────────────────────────────────────────────
+
+async def get_users(members: list) -> dict:
+    return await _run([_uid(m) for m in members], _eco.get_users, members)
+
+async def update_users(mapping: dict) -> dict:
+    return await _run([_uid(m) for m in mapping], _eco.update_users, mapping)
+
+# ─── Profile / Daily / Missions ───────────────────────────────────────────────
+
+async def get_balance(user_id: int, username: str = "") -> int:
+    return await _run([user_id], _eco.get_balance, user_id, username)
+
+async def get_fields(user_id: int, *fields: str, username: str = "") -> dict:
+    return await _run([user_id], _eco.get_fields, user_id, *fields, username=username)
+
+async def get_profile(user_id: int, username: str = "") -> dict:
+    return await _run([user_id], _eco.get_profile, user_id, username)
+
+async def get_missions(user_id: int, username: str = "") -> dict:
+    return await _run([user_id], _eco.get_missions, user_id, username)
+
+async def get_inventory(user_id: int, username: str = "") -> dict:
+    return await _run([user_id], _eco.get_inventory, user_id, username)
+
+async def get_leaderboard(top: int = 10, offset: int = 0, by: str = "balance") -> list:
+    return await _run([], _eco.get_leaderboard, top, offset, by)
+
+async def get_rank(user_id: int, username: str = "", by: str = "balance") -> dict:
+    return await _run([user_id], _eco.get_rank, user_id, username, by)
+
+async def get_history(user_id: int, username: str = "", kind: str | None = None,
+                      since: str | None = None, until: str | None = None,
+                      before: tuple | None = None) -> dict:
+    return await _run([user_id], _eco.get_history, user_id, username, kind, since, until, before)
+
+async def claim_daily(user_id: int, username: str) -> dict:
+    return await _run([user_id], _eco.claim_daily, user_id, username)
+
+# ─── Shop / Gacha / Transfer ──────────────────────────────────────────────────
+
+async def buy_item(user_id: int, username: str, item_id: str, quantity: int = 1) -> dict:
+    return await _run([user_id], _eco.buy_item, user_id, username, item_id, quantity)
+
+async def gacha_pull(user_id: int, username: str, count: int = 1, use_ticket: bool = False) -> dict:
+    return await _run([user_id], _eco.gacha_pull, user_id, username, count, use_ticket)
+
+async def send_transfer(sender_id: int, sender_name: str,
+                        receiver_id: int, receiver_name: str, amount: int) -> dict:
+    return await _run([sender_id, receiver_id], _eco.send_transfer,
+                      sender_id, sender_name, receiver_id, receiver_name, amount)
+
+# ─── Work / Hourly / Rob ──────────────────────────────────────────────────────
+
+async def do_work(user_id: int, username: str) -> dict:
+    return await _run([user_id], _eco.do_work, user_id, username)
+
+async def claim_hourly(user_id: int, username: str) -> dict:
+    return await _run([user_id], _eco.claim_hourly, user_id, username)
+
+async def do_rob(robber_id: int, robber_name: str, victim_id: int, victim_name: str) -> dict:
+    return await _run([robber_id, victim_id], _eco.do_rob,
+                      robber_id, robber_name, victim_id, victim_name)
+
+async def get_cooldowns(user_id: int) -> dict:
+    return await _run([user_id], _eco.get_cooldowns, user_id)
+
+async def pop_ready_cooldowns() -> dict:
+    return await _run([], _eco.pop_ready_cooldowns)
+
+# ─── Casino ───────────────────────────────────────────────────────────────────
+
+async def casino_coinflip(user_id: int, username: str, bet: int, choice: str) -> dict:
+    return await _run([user_id], _eco.casino_coinflip, user_id, username, bet, choice)
+
+async def casino_dice(user_id: int, username: str, bet: int, guess: int) -> dict:
+    return await _run([user_id], _eco.casino_dice, user_id, username, bet, guess)
+
+async def casino_slots(user_id: int, username: str, bet: int) -> dict:
+    return await _run([user_id], _eco.casino_slots, user_id, username, bet)
+
+async def casino_number(user_id: int, username: str, bet: int, guess: int, max_num: int = 10) -> dict:
+    return await _run([user_id], _eco.casino_number, user_id, username, bet, guess, max_num)
+
+async def blackjack_deal(user_id: int, username: str, bet: int) -> dict:
+    return await _run([user_id], _eco.blackjack_deal, user_id, username, bet)
+
+async def blackjack_resolve(state: dict, action: str) -> dict:
+    return await _run([state["user_id"]], _eco.blackjack_resolve, state, action)
+
+# ─── Russian Roulette ─────────────────────────────────────────────────────────
+
+async def roulette_payout(user_id: int, username: str, pot: int) -> dict:
+    return await _run([user_id], _eco.roulette_payout, user_id, username, pot)
+
+# ─── Werewolf ─────────────────────────────────────────────────────────────────
+
+async def progress_vote(user_id: int, username: str):
+    return await _run([user_id], _eco.progress_vote, user_id, username)
+
+async def award_game_end(players_result: list) -> list:
+    return await _run([pr["user_id"] for pr in players_result], _eco.award_game_end, players_result)
+
+# ─── Storage ──────────────────────────────────────────────────────────────────
+
+async def load():
+    return await _run([], _eco.load)
+
+async def flush() -> int:
+    return await _run([], _eco.flush)
+
+async def tier_stats() -> dict:
+    return await _run([], _eco.tier_stats)
+
+EVICT_BATCH = 256
+
+async def evict_dormant() -> int:
+    """Move idle users to the cold tier, holding one batch of them at a time."""
+    uids    = await _run([], _eco.dormant_users)
+    evicted = 0
+    for i in range(0, len(uids), EVICT_BATCH):
+        batch    = uids[i:i + EVICT_BATCH]
+        evicted += await _run(batch, _eco.evict_users, batch)
+    return evicted
@@ -0,0 +1,234 @@
+"""
+WowoCash benchmarks
+
+    python -m economy.bench daily_burst [claims] [seconds]
+    python -m economy.bench record_memory [users]
+    python -m economy.bench gacha_sampler [pulls]
+
+daily_burst replays the midnight /wowo_daily rush: `claims` users (default
+1000) each claim once, spread evenly over `seconds` (default 1). The clock
+is started just before a Monday midnight and the burst begins on it, so
+the first claims switch both the day and the week. Every user last claimed
+on the Sunday and still has last week's mission counters.
+
+record_memory measures the resident size of `users` records (default
+10000, cloned round-robin from SAMPLE_FILE, the live data/wowocash.json)
+as plain nested dicts holding a deque of entry tuples and as UserRecords
+holding a packed TxRing, with tracemalloc. Both are measured as they sit
+after first use, with transaction rings decoded and missions rolled to the
+current period.
+
+gacha_sampler draws `pulls` gacha results (default 1000000) through the
+pull-state logic, once by rebuilding the pool and calling random.choices
+as _single_pull used to, and once as one _draw_pulls batch from the
+precomputed alias tables. Both start with pulls // 10 lucky charms and
+move the pity counters as real pulls do, so every state is exercised;
+payouts are left out so only the draw is timed.
+
+Reading SAMPLE_FILE aside, none of them touches data/: WOWO_DATA_DIR is
+pointed at a temporary directory before the engine is imported, and each
+run gets a fresh store, ledger, cold tier and engine caches (_scratch).
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Before the engine is imported: every path it derives lands in a scratch dir.
+SAMPLE_FILE = Path(__file__).parent.parent / "data" / "wowocash.json"
+_DATA_DIR   = tempfile.TemporaryDirectory(prefix="wowo-bench-")
+os.environ["WOWO_DATA_DIR"] = _DATA_DIR.name
+
+from economy import txlog
+from economy import wowocash as eco
+from economy.aio import IO_WORKERS
+from economy.coldstore import ColdStore
+from economy.cooldowns import CooldownIndex
+from economy.leaderboard import RankIndex
+from economy.ledger import Ledger
+from economy.record import UserRecord, encode
+from economy.rollover import PeriodClock, period_of
+from economy.store import JournalBackend, UserStore
+
+def _next_monday_midnight() -> float:
+    d = date.today()
+    d += timedelta(days=7 - d.weekday())
+    return datetime.combine(d, datetime.min.time()).timestamp()
+
+def _scratch(tmp: Path, users: dict):
+    """Point the engine at a fresh store holding users, with every cache reset."""
+    data_file = tmp / "wowocash.json"
+    data_file.write_text(json.dumps({"users": users, "meta": {}}, default=encode))
+    eco._store = UserStore(
+        JournalBackend(data_file, tmp / "wowocash.journal", replay=eco._replay,
+                       max_bytes=eco.JOURNAL_MAX_KB * 1024),
+        commit_window=eco.COMMIT_WINDOW_MS / 1000,
+        cold=ColdStore(tmp / "wowocash.cold.db"),
+    )
+    eco._ledger           = Ledger(tmp / "ledger.db", commit_window=eco.COMMIT_WINDOW_MS / 1000)
+    eco._ledger_ready     = False
+    eco._ledger_pending   = []
+    eco._ranks            = {key: RankIndex() for key in eco.LEADERBOARD_KEYS}
+    eco._ranks_ready      = False
+    eco._cooldowns        = CooldownIndex()
+    eco._cooldowns_ready  = False
+    eco._clock            = PeriodClock()
+    eco._load()
+
+def daily_burst(claims: int = 1000, seconds: float = 1.0) -> dict:
+    boundary = _next_monday_midnight()
+    sunday   = period_of(date.fromtimestamp(boundary - 1))
+
+    users = {}
+    for i in range(claims):
+        uid  = str(10**17 + i)
+        user = eco._default_user(uid, f"user{i}")
+        user["daily"]    = {"last_claim": sunday.day, "streak": 3}
+        user["missions"] = {
+            "daily":  {"period": sunday.day,  "progress": [0] * len(eco.DAILY_MISSIONS)},
+            "weekly": {"period": sunday.week, "progress": [1] * len(eco.WEEKLY_MISSIONS)},
+        }
+        users[uid] = user
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _scratch(Path(tmp), users)
+        start      = time.time() + 0.05
+        shift      = boundary - start
+        eco._clock = PeriodClock(now=lambda: time.time() + shift)   # Sunday, 50 ms to go
+
+        def claim(i: int):
+            due = start + i * seconds / claims
+            time.sleep(max(0.0, due - time.time()))
+            result = eco.claim_daily(10**17 + i, f"user{i}")
+            return result["success"], time.time() - due, eco._clock.get().day
+
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as pool:
+            results = list(pool.map(claim, range(claims)))
+        elapsed = time.time() - start
+        eco._store.commit()   # close the open batch the normal way
+        eco._ledger.flush()
+        journal = sum(p.stat().st_size for p in Path(tmp).glob("wowocash.journal*"))
+
+        latencies = sorted(r[1] * 1000 for r in results)
+        return {
+            "claims":         claims,
+            "succeeded":      sum(r[0] for r in results),
+            "elapsed_s":      round(elapsed, 3),
+            "claims_per_s":   round(claims / elapsed, 1),
+            "p50_ms":         round(statistics.median(latencies), 3),
+            "p99_ms":         round(latencies[int(len(latencies) * 0.99) - 1], 3),
+            "days_seen":      sorted({r[2] for r in results}),
+            "journal_kb":     round(journal / 1024, 1),
+            "commits":        eco.commit_stats(),
+        }
+
+def record_memory(users: int = 10000) -> dict:
+    templates = list(json.loads(SAMPLE_FILE.read_text(encoding="utf-8"))["users"].values()) if SAMPLE_FILE.exists() else []
+    if not templates:
+        templates = [eco._default_user("0", "user").to_json()]
+    text = json.dumps({
+        str(10**17 + i): {**templates[i % len(templates)], "id": str(10**17 + i)}
+        for i in range(users)
+    }, default=encode)
+
+    period = eco._clock.get()
+
+    def settle(user, packed: bool):
+        if packed:
+            txlog.ring(user)
+        else:   # the ring as it was before TxRing: a deque of entry tuples
+            user["transactions"] = deque(map(txlog.decode, user["transactions"]), maxlen=txlog.TX_KEEP)
+        eco._mission_counts(user, "daily", period.day)
+        eco._mission_counts(user, "weekly", period.week)
+        return user
+
+    def measure(build, packed: bool = True) -> int:
+        tracemalloc.start()
+        kept = {uid: settle(u, packed) for uid, u in build().items()}
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return size
+
+    as_dicts   = measure(lambda: json.loads(text), packed=False)
+    as_records = measure(lambda: {uid: UserRecord(u) for uid, u in json.loads(text).items()})
+    per_10k    = 10000 / users
+    return {
+        "users":            users,
+        "dicts_mb_per_10k":   round(as_dicts * per_10k / 2**20, 2),
+        "records_mb_per_10k": round(as_records * per_10k / 2**20, 2),
+        "saved_pct":          round(100 * (1 - as_records / as_dicts), 1),
+    }
+
+def _old_pick(g: dict) -> dict:
+    """The pre-alias-table draw from _single_pull, kept for comparison."""
+    if g["pity_ssr"] >= eco.GACHA_SSR_PITY:
+        pool = [e for e in eco.GACHA_POOL if e["rarity"] == "SSR"]
+    elif g["pity_sr"] >= eco.GACHA_PITY_LIMIT:
+        pool = [e for e in eco.GACHA_POOL if e["rarity"] in ("SR", "SSR")]
+    else:
+        lucky_boost = eco.GACHA_LUCKY_BOOST if g.get("lucky_charm", 0) > 0 else 0
+        if g.get("lucky_charm", 0) > 0:
+            g["lucky_charm"] -= 1
+        pool = []
+        for e in eco.GACHA_POOL:
+            w = e["weight"] + lucky_boost if e["rarity"] == "SSR" else e["weight"]
+            pool.append({**e, "weight": w})
+    weights = [e["weight"] for e in pool]
+    return random.choices(pool, weights=weights, k=1)[0]
+
+def _old_draw(g: dict, pulls: int) -> list[dict]:
+    drawn = []
+    for _ in range(pulls):
+        g["pity_sr"]  += 1
+        g["pity_ssr"] += 1
+        chosen = _old_pick(g)
+        if chosen["rarity"] in ("SR", "SSR"):
+            g["pity_sr"] = 0
+        if chosen["rarity"] == "SSR":
+            g["pity_ssr"] = 0
+        drawn.append(chosen)
+    return drawn
+
+def gacha_sampler(pulls: int = 1000000) -> dict:
+    def run(draw) -> tuple[float, dict]:
+        random.seed(1)
+        g      = {"pity_sr": 0, "pity_ssr": 0, "lucky_charm": pulls // 10, "total_pulls": 0}
+        start  = time.perf_counter()
+        drawn  = draw(g, pulls)
+        secs   = time.perf_counter() - start
+        counts = dict.fromkeys(eco.RARITY_EMOJI, 0)
+        for e in drawn:
+            counts[e["rarity"]] += 1
+        return secs, counts
+
+    old_s, old_counts = run(_old_draw)
+    new_s, new_counts = run(eco._draw_pulls)
+    return {
+        "pulls":        pulls,
+        "old_s":        round(old_s, 3),
+        "alias_s":      round(new_s, 3),
+        "speedup":      round(old_s / new_s, 2),
+        "old_rates":    {r: round(n / pulls, 5) for r, n in old_counts.items()},
+        "alias_rates":  {r: round(n / pulls, 5) for r, n in new_counts.items()},
+    }
+
+BENCHMARKS = {"daily_burst": daily_burst, "record_memory": record_memory, "gacha_sampler": gacha_sampler}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        sys.exit(__doc__)
+    args = [float(a) for a in sys.argv[2:4]]
+    if args:
+        args[0] = int(args[0])
+    print(json.dumps(BENCHMARKS[sys.argv[1]](*args), indent=2))
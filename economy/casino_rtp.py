@@ -0,0 +1,224 @@
+"""
+WowoCash casino return-to-player (RTP) analyzer
+
+    python -m economy.casino_rtp
+
+Exact RTP, house edge and per-hand variance for every casino game, computed
+from the engine's own payout rules rather than by sampling:
+
+    coinflip, dice, number   enumerated with exact fractions (number at
+                             the worst max_num in NUMBER_SCAN)
+    slots                    every reel combination of SLOT_WEIGHTS
+    blackjack                dynamic programming over the remaining deck
+
+All figures are per unit bet. Payouts the engine truncates with int() for
+odd bets (coinflip, dice, the two-cherry 0.5x, the 1.5x natural) are taken
+at face value; truncation only ever rounds in the house's favour.
+
+Blackjack is the bot's game: one fresh 52-card deck per hand, hit or stand
+only, the dealer stands on all 17s and never peeks, any two-card 21 pays
+BJ_NATURAL_PAYOUT, equal totals push. The player is assumed to play the
+composition-dependent optimal hit/stand strategy, so the blackjack edge is
+the house's smallest possible one. The blackjack DP visits about 176k
+dealer states and takes a few seconds; the other games are instant.
+
+check() fails any game whose house edge is below its MIN_HOUSE_EDGE
+target, and any game with no edge at all. The CLI prints the table and
+exits non-zero when a game fails, so a payout change that hands money to
+players shows up before it ships.
+"""
+
+import sys
+from fractions import Fraction
+from itertools import product
+
+from economy import wowocash as eco
+
+# Lowest acceptable house edge per game. Blackjack's is measured against
+# optimal play, so its target sits lower than the others'.
+MIN_HOUSE_EDGE = {"coinflip": 0.02, "dice": 0.02, "slots": 0.05, "number": 0.05, "blackjack": 0.01}
+
+# casino_number takes any max_num. Its multiplier is int(max_num * 0.9), so
+# the edge never drops below 10%; the scan confirms it for the usual ranges
+# and catches a multiplier change that breaks that.
+NUMBER_SCAN = range(1, 1001)
+
+
+def _report(outcomes) -> dict:
+    """{rtp, house_edge, variance} from (probability, net win per unit bet) pairs."""
+    mean = sum(p * x for p, x in outcomes)
+    m2   = sum(p * x * x for p, x in outcomes)
+    return {
+        "rtp":        float(1 + mean),
+        "house_edge": float(-mean),
+        "variance":   float(m2 - mean * mean),
+    }
+
+# ─── Simple games ─────────────────────────────────────────────────────────────
+
+def coinflip() -> dict:
+    return _report([(Fraction(1, 2), Fraction(str(eco.COINFLIP_PAYOUT))), (Fraction(1, 2), -1)])
+
+def dice() -> dict:
+    return _report([(Fraction(1, 6), Fraction(str(eco.DICE_PAYOUT))), (Fraction(5, 6), -1)])
+
+def number(max_num: int | None = None) -> dict:
+    """One max_num, or the lowest-edge max_num in NUMBER_SCAN when None."""
+    if max_num is None:
+        return min((number(n) for n in NUMBER_SCAN), key=lambda r: r["house_edge"])
+    win = Fraction(1, max_num)
+    return {**_report([(win, eco._number_multiplier(max_num) - 1), (1 - win, -1)]), "max_num": max_num}
+
+def slots() -> dict:
+    weights = [Fraction(w).limit_denominator(10**6) for w in eco.SLOT_WEIGHTS]
+    total   = sum(weights)
+    odds    = dict(zip(eco.SLOT_SYMBOLS, (w / total for w in weights)))
+    return _report([
+        (odds[a] * odds[b] * odds[c], Fraction(eco._slot_multiplier((a, b, c))).limit_denominator() - 1)
+        for a, b, c in product(eco.SLOT_SYMBOLS, repeat=3)
+    ])
+
+# ─── Blackjack ────────────────────────────────────────────────────────────────
+
+_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)     # card values; 10 covers 10/J/Q/K, 11 is an ace
+
+def _add(total: int, soft: int, value: int) -> tuple[int, int]:
+    """Add a card to a (total, aces counted as 11) hand, as _bj_hand_value does."""
+    total += value
+    soft  += value == 11
+    while total > 21 and soft:
+        total -= 10
+        soft  -= 1
+    return total, soft
+
+def _draw(deck: tuple):
+    """(probability, value, deck without that card) for every card left."""
+    left = sum(deck)
+    for i, count in enumerate(deck):
+        if count:
+            yield count / left, _VALUES[i], deck[:i] + (count - 1,) + deck[i + 1:]
+
+
+class _Blackjack:
+    def __init__(self):
+        self.stands  = eco.BJ_DEALER_STANDS
+        self.natural = eco.BJ_NATURAL_PAYOUT
+        self._dealer_memo: dict = {}
+        self._player_memo: dict = {}
+
+    def dealer(self, deck: tuple, total: int, soft: int) -> tuple:
+        """Final dealer totals as probabilities: index t - stands for t in stands..21, last = bust."""
+        key  = (deck, total, soft)
+        dist = self._dealer_memo.get(key)
+        if dist is not None:
+            return dist
+        # The hot loop: _draw/_add inlined, and a card that ends the dealer's hand
+        # is counted here instead of costing a call and a memo entry.
+        stands = self.stands
+        dist   = [0.0] * (23 - stands)
+        left   = sum(deck)
+        for i, count in enumerate(deck):
+            if not count:
+                continue
+            value = _VALUES[i]
+            t, s  = total + value, soft + (value == 11)
+            if t > 21 and s:                     # below 17 at most one ace has to drop
+                t, s = t - 10, s - 1
+            p = count / left
+            if t >= stands:
+                dist[-1 if t > 21 else t - stands] += p
+            else:
+                sub  = self.dealer(deck[:i] + (count - 1,) + deck[i + 1:], t, s)
+                dist = [a + p * b for a, b in zip(dist, sub)]
+        dist = self._dealer_memo[key] = tuple(dist)
+        return dist
+
+    def stand(self, deck: tuple, total: int, up: int, natural: bool = False) -> tuple[float, float]:
+        """(mean, second moment) of the net win for standing on total."""
+        dist = self.dealer(deck, *_add(0, 0, up))
+        mean = m2 = 0.0
+        for i, p in enumerate(dist):
+            dealer = 22 if i == len(dist) - 1 else self.stands + i
+            if natural:
+                x = 0.0 if dealer == 21 else self.natural
+            elif dealer > 21 or total > dealer:
+                x = 1.0
+            elif total == dealer:
+                x = 0.0
+            else:
+                x = -1.0
+            mean += p * x
+            m2   += p * x * x
+        return mean, m2
+
+    def play(self, deck: tuple, total: int, soft: int, up: int) -> tuple[float, float]:
+        """(mean, second moment) under the better of hit and stand, hitting again as needed."""
+        key = (deck, total, soft, up)
+        best = self._player_memo.get(key)
+        if best is not None:
+            return best
+        best = self.stand(deck, total, up)
+        if total < 21:                                   # the bot auto-stands on 21
+            mean = m2 = 0.0
+            for p, value, rest in _draw(deck):
+                t, s = _add(total, soft, value)
+                sub_mean, sub_m2 = (-1.0, 1.0) if t > 21 else self.play(rest, t, s, up)
+                mean += p * sub_mean
+                m2   += p * sub_m2
+            if mean > best[0]:
+                best = (mean, m2)
+        self._player_memo[key] = best
+        return best
+
+    def analyze(self) -> dict:
+        deck = (4,) * 8 + (16, 4)
+        mean = m2 = 0.0
+        for p1, c1, d1 in _draw(deck):
+            for p2, c2, d2 in _draw(d1):
+                for p3, up, d3 in _draw(d2):
+                    p            = p1 * p2 * p3
+                    total, soft  = _add(*_add(0, 0, c1), c2)
+                    if total == 21:
+                        sub = self.stand(d3, total, up, natural=True)
+                    else:
+                        sub = self.play(d3, total, soft, up)
+                    mean += p * sub[0]
+                    m2   += p * sub[1]
+        return {"rtp": 1 + mean, "house_edge": -mean, "variance": m2 - mean * mean}
+
+def blackjack() -> dict:
+    return _Blackjack().analyze()
+
+# ─── All games ────────────────────────────────────────────────────────────────
+
+GAMES = {
+    "coinflip":  coinflip,
+    "dice":      dice,
+    "slots":     slots,
+    "number":    number,
+    "blackjack": blackjack,
+}
+
+def analyze() -> dict:
+    """{game: {rtp, house_edge, variance}} for every casino game."""
+    return {name: game() for name, game in GAMES.items()}
+
+def check(report: dict | None = None) -> list[str]:
+    """Games below their MIN_HOUSE_EDGE target or with no edge at all, as messages. Empty when all pass."""
+    report = report or analyze()
+    return [
+        f"{name}: house edge {r['house_edge']:.4%} < target {MIN_HOUSE_EDGE[name]:.4%}"
+        for name, r in report.items()
+        if r["house_edge"] <= 1e-12 or r["house_edge"] < MIN_HOUSE_EDGE[name] - 1e-12
+    ]
+
+
+if __name__ == "__main__":
+    report = analyze()
+    print(f"{'game':<10} {'RTP':>9} {'edge':>9} {'variance':>9}")
+    for name, r in report.items():
+        print(f"{name:<10} {r['rtp']:>9.4%} {r['house_edge']:>9.4%} {r['variance']:>9.4f}")
+    failures = check(report)
+    for line in failures:
+        print(f"FAIL {line}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,104 @@
+"""
+WowoCash cold tier — dormant users out of the resident economy
+
+Users idle for long enough are moved out of memory and out of the main
+snapshot into data/wowocash.cold.db: one SQLite row per user holding the
+zlib-compressed JSON record, plus a small summary (username and leaderboard
+values) so rankings still include them. The first lookup of a cold user
+brings the record back into the resident store (UserStore.get).
+
+Only the set of cold ids is kept in memory. A user that is resident again
+keeps its cold row until the next start, when rows for users the hot store
+already holds are dropped: the hot copy always wins, so a crash between
+the two tiers' writes never loses or duplicates anyone.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cold_users (
+    id          TEXT    PRIMARY KEY,
+    last_active INTEGER NOT NULL,
+    summary     TEXT    NOT NULL,
+    body        BLOB    NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class ColdStore:
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn: sqlite3.Connection | None = None
+        self._ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+        return self.conn
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def load(self, hot) -> int:
+        """Read the cold ids, dropping rows for users in `hot`. No file, no tier yet."""
+        if not self.path.exists():
+            return 0
+        with self._lock:
+            conn  = self._connect()
+            ids   = {uid for (uid,) in conn.execute("SELECT id FROM cold_users")}
+            stale = [(uid,) for uid in ids if uid in hot]
+            if stale:
+                with conn:
+                    conn.executemany("DELETE FROM cold_users WHERE id = ?", stale)
+            self._ids = ids.difference(uid for (uid,) in stale)
+        return len(self._ids)
+
+    def put(self, rows):
+        """Store (uid, last_active, summary, record_json) rows in one commit."""
+        rows = [
+            (uid, last_active, json.dumps(summary, ensure_ascii=False),
+             zlib.compress(body.encode("utf-8")))
+            for uid, last_active, summary, body in rows
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO cold_users VALUES (?, ?, ?, ?)", rows)
+            self._ids.update(row[0] for row in rows)
+
+    def take(self, uid: str) -> dict | None:
+        """The user's record, no longer counted as cold. The row stays until the next load()."""
+        with self._lock:
+            if uid not in self._ids:
+                return None
+            row = self._connect().execute("SELECT body FROM cold_users WHERE id = ?", (uid,)).fetchone()
+            self._ids.discard(uid)
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def summary(self, uid: str) -> dict | None:
+        with self._lock:
+            if uid not in self._ids:
+                return None
+            row = self._connect().execute("SELECT summary FROM cold_users WHERE id = ?", (uid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def summaries(self) -> list[tuple[str, dict]]:
+        """[(uid, summary), ...] for every cold user."""
+        if not self._ids:
+            return []
+        with self._lock:
+            rows = self._connect().execute("SELECT id, summary FROM cold_users").fetchall()
+            return [(uid, json.loads(s)) for uid, s in rows if uid in self._ids]
@@ -0,0 +1,75 @@
+"""
+WowoCash Cooldown Index
+
+Every work/hourly/rob timer as an integer "ready at" epoch second, held in
+memory beside the economy. A user's timers are one dict lookup, and a
+min-heap orders them by expiry so "who just became ready" is answered from
+the top of the heap instead of by scanning users.
+
+Heap entries are never updated in place: resetting a timer pushes a new
+entry, and the outdated one is dropped when it surfaces (or when the heap
+is rebuilt after growing past twice the number of live timers).
+"""
+
+import heapq
+import threading
+
+
+class CooldownIndex:
+    def __init__(self):
+        self._ready: dict[str, dict[str, int]]  = {}   # uid → {key: ready_at}
+        self._heap:  list[tuple[int, str, str]] = []   # (ready_at, uid, key)
+        self._live  = 0
+        self._lock  = threading.Lock()
+
+    def build(self, timers):
+        """Replace the index with (uid, key, ready_at) triples in one heapify."""
+        with self._lock:
+            self._ready = {}
+            for uid, key, ready_at in timers:
+                self._ready.setdefault(uid, {})[key] = ready_at
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(t, uid, key) for uid, keys in self._ready.items() for key, t in keys.items()]
+        self._live = len(self._heap)
+        heapq.heapify(self._heap)
+
+    def set(self, uid: str, key: str, ready_at: int):
+        with self._lock:
+            keys = self._ready.setdefault(uid, {})
+            if key not in keys:
+                self._live += 1
+            keys[key] = ready_at
+            heapq.heappush(self._heap, (ready_at, uid, key))
+            if len(self._heap) > 2 * self._live + 64:
+                self._rebuild()
+
+    def ready_at(self, uid: str, key: str) -> int:
+        """Epoch second the timer runs out, 0 if it was never set."""
+        return self._ready.get(uid, {}).get(key, 0)
+
+    def timers(self, uid: str) -> dict[str, int]:
+        """{key: ready_at} for one user."""
+        with self._lock:
+            return dict(self._ready.get(uid, {}))
+
+    def next_expiry(self) -> int | None:
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: int) -> list[tuple[str, str]]:
+        """[(uid, key), ...] for timers that ran out by now, each reported once."""
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                ready_at, uid, key = heapq.heappop(self._heap)
+                keys = self._ready.get(uid, {})
+                if keys.get(key) != ready_at:
+                    continue   # reset since; a newer entry is further down
+                del keys[key]
+                if not keys:
+                    del self._ready[uid]
+                self._live -= 1
+                expired.append((uid, key))
+        return expired
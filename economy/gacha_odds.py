@@ -0,0 +1,76 @@
+"""
+WowoCash gacha odds — exact SSR chances per pity state
+
+A pull's outcome depends only on (pity_sr, pity_ssr, lucky_charm), so the
+gacha is a Markov chain over those states with "got an SSR" as the
+absorbing state. pity_ssr only matters through hard pity: until it forces
+an SSR it changes no probabilities. The chain is therefore solved once on
+(pity_sr, lucky_charm) alone:
+
+    survive[n][c][sr] = P(no SSR in the next n pulls | pity_sr=sr, lucky_charm=c)
+
+and pity_ssr cuts the horizon off at the forced pull. The table covers
+every horizon up to GACHA_SSR_PITY pulls (beyond that an SSR is certain)
+and every charm count up to the horizon (a charm lasting longer than the
+pulls left behaves the same). It takes well under a second to build at
+import, and a lookup is three list indexes.
+"""
+
+from array import array
+
+
+class GachaOdds:
+    def __init__(self, samplers: dict, pity_limit: int, ssr_pity: int):
+        """samplers is the engine's {state: (entries, AliasTable)} (gacha_samplers)."""
+        self.pity_limit = pity_limit
+        self.ssr_pity   = ssr_pity
+
+        # Per state: (P(SR), P(N or R)); the rest of each state's mass is SSR.
+        split = {}
+        for state, (entries, table) in samplers.items():
+            probs = table.probabilities()
+            sr    = sum(p for e, p in zip(entries, probs) if e["rarity"] == "SR")
+            ssr   = sum(p for e, p in zip(entries, probs) if e["rarity"] == "SSR")
+            split[state] = (sr, max(0.0, 1.0 - sr - ssr))
+        sr_forced, _     = split["sr_pity"]
+        sr_lucky, low_lucky   = split["lucky"]
+        sr_normal, low_normal = split["normal"]
+
+        ones = array("d", [1.0] * pity_limit)
+        self._survive: list[list[array]] = [[ones]]   # [n][c][pity_sr]
+        for n in range(1, ssr_pity):
+            prev = self._survive[n - 1]
+            rows = []
+            for c in range(n + 1):
+                row = array("d", bytes(8 * pity_limit))
+                for sr in range(pity_limit):
+                    if sr + 1 >= pity_limit:                      # SR pity: SR or SSR
+                        row[sr] = sr_forced * prev[min(c, n - 1)][0]
+                    elif c:                                       # lucky charm used up by one
+                        nxt = prev[min(c - 1, n - 1)]
+                        row[sr] = low_lucky * nxt[sr + 1] + sr_lucky * nxt[0]
+                    else:
+                        nxt = prev[0]
+                        row[sr] = low_normal * nxt[sr + 1] + sr_normal * nxt[0]
+                rows.append(row)
+            self._survive.append(rows)
+
+    def _no_ssr(self, n: int, pity_sr: int, pity_ssr: int, lucky_charm: int) -> float:
+        if pity_ssr + n >= self.ssr_pity:
+            return 0.0                                            # hard pity lands within n
+        sr = min(max(pity_sr, 0), self.pity_limit - 1)
+        return self._survive[n][min(max(lucky_charm, 0), n)][sr]
+
+    def ssr_within(self, pulls: int, pity_sr: int, pity_ssr: int, lucky_charm: int = 0) -> float:
+        """Exact chance of at least one SSR in the next `pulls` pulls from this state."""
+        if pulls <= 0:
+            return 0.0
+        return 1.0 - self._no_ssr(pulls, pity_sr, max(pity_ssr, 0), lucky_charm)
+
+    def expected_pulls(self, pity_sr: int, pity_ssr: int, lucky_charm: int = 0) -> float:
+        """Expected number of pulls until the next SSR, the forced one included."""
+        pity_ssr = max(pity_ssr, 0)
+        return sum(
+            self._no_ssr(n, pity_sr, pity_ssr, lucky_charm)
+            for n in range(max(0, self.ssr_pity - pity_ssr))
+        )
@@ -0,0 +1,149 @@
+"""
+WowoCash gacha simulator — Monte Carlo over many users at once
+
+    python -m economy.gacha_sim [users] [pulls] [lucky]
+
+Simulates `users` players (default 10000) each pulling `pulls` times
+(default 1000) in a row, starting with `lucky` lucky-charm pulls (default
+0). The players are NumPy arrays and every step pulls once for all of them,
+so ten million pulls take about a second. Pity and lucky-charm counters move
+exactly as in _draw_pulls, and draws use the probabilities of the engine's
+own samplers (gacha_samplers), so the numbers describe the live gacha.
+
+Reports the rarity rates, coins paid back per pull and per
+GACHA_PULL_COST, item value per pull (at shop price), the net amount of
+money each pull takes out of the economy, and the distribution of pulls
+needed for an SSR. Every player's wait still open when their pulls run out
+is kept as a censored wait, and the distribution is the Kaplan-Meier
+estimate: per wait length k, the chance of an SSR at k among all waits
+that reached k. Dropping open waits instead would favour short ones.
+
+To try a tuning change, call simulate() with a different pool, pity limits
+or lucky boost; it returns the same report as the CLI. Needs numpy, which
+the bot itself does not (requirements-dev.txt).
+"""
+
+import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("economy.gacha_sim needs numpy: pip install -r requirements-dev.txt") from e
+
+from economy import wowocash as eco
+
+RARITIES = ("N", "R", "SR", "SSR")
+STATES   = ("normal", "lucky", "sr_pity", "ssr_pity")
+
+
+def _state_tables(pool, lucky_boost) -> list[tuple]:
+    """Per state, in STATES order: (cumulative probs, rarity index, coins, item value)."""
+    samplers = eco.gacha_samplers(pool, lucky_boost)
+    tables   = []
+    for state in STATES:
+        entries, table = samplers[state]
+        cum     = np.cumsum(table.probabilities())
+        cum[-1] = 1.0
+        tables.append((
+            cum,
+            np.array([RARITIES.index(e["rarity"]) for e in entries], dtype=np.int8),
+            np.array([e["amount"] if e["type"] == "coins" else 0 for e in entries], dtype=np.int64),
+            np.array([
+                e["amount"] * eco.SHOP_ITEMS[e["item"]]["price"] if e["type"] == "item" else 0
+                for e in entries
+            ], dtype=np.int64),
+        ))
+    return tables
+
+
+def simulate(users: int = 10000, pulls: int = 1000, lucky: int = 0, seed: int | None = None,
+             pool: list = eco.GACHA_POOL, pity_limit: int = eco.GACHA_PITY_LIMIT,
+             ssr_pity: int = eco.GACHA_SSR_PITY, lucky_boost: float = eco.GACHA_LUCKY_BOOST,
+             cost: int = eco.GACHA_PULL_COST) -> dict:
+    rng    = np.random.default_rng(seed)
+    tables = _state_tables(pool, lucky_boost)
+
+    pity_sr  = np.zeros(users, dtype=np.int32)
+    pity_ssr = np.zeros(users, dtype=np.int32)
+    charm    = np.full(users, lucky, dtype=np.int32)
+
+    rarity_counts = np.zeros(len(RARITIES), dtype=np.int64)
+    to_ssr        = np.zeros(ssr_pity + 1, dtype=np.int64)   # waits ending in an SSR, by length
+    at_risk       = np.zeros(ssr_pity + 1, dtype=np.int64)   # waits that reached each length
+    coins_total   = 0
+    items_total   = 0
+    lucky_pulls   = 0
+
+    rarity = np.empty(users, dtype=np.int8)
+    start  = time.perf_counter()
+    for _ in range(pulls):
+        pity_sr  += 1
+        pity_ssr += 1
+        state = np.where(pity_ssr >= ssr_pity, 3, np.where(pity_sr >= pity_limit, 2, np.where(charm > 0, 1, 0)))
+        boosted = state == 1
+        charm  -= boosted
+        lucky_pulls += int(boosted.sum())
+
+        u = rng.random(users)
+        for s, (cum, ranks, coins, value) in enumerate(tables):
+            who = np.flatnonzero(state == s)
+            if not who.size:
+                continue
+            pick         = np.searchsorted(cum, u[who], side="right")
+            rarity[who]  = ranks[pick]
+            coins_total += int(coins[pick].sum())
+            items_total += int(value[pick].sum())
+
+        rarity_counts += np.bincount(rarity, minlength=len(RARITIES))
+        ssr = rarity == 3
+        at_risk += np.bincount(pity_ssr, minlength=ssr_pity + 1)
+        to_ssr  += np.bincount(pity_ssr[ssr], minlength=ssr_pity + 1)
+        pity_sr[rarity >= 2] = 0
+        pity_ssr[ssr]        = 0
+    seconds = time.perf_counter() - start
+
+    total   = users * pulls
+    hits    = int(to_ssr.sum())
+    hazard  = to_ssr / np.maximum(at_risk, 1)
+    survive = np.cumprod(1 - hazard)
+    pmf     = np.concatenate(([0.0], survive[:-1])) * hazard
+    # A run too short for any wait to reach hard pity never sees the tail, so
+    # pmf sums to less than 1; the mean and hard-pity share are left out then.
+    known   = hits and at_risk[ssr_pity] > 0
+    cdf     = np.cumsum(pmf)
+
+    def pct(q: float) -> int | None:
+        i = int(np.searchsorted(cdf, q))
+        return i if hits and i <= ssr_pity else None
+
+    coins_per_pull = coins_total / total
+    return {
+        "users":               users,
+        "pulls":               total,
+        "lucky_pulls":         lucky_pulls,
+        "seconds":             round(seconds, 2),
+        "rates":               {r: round(int(n) / total, 5) for r, n in zip(RARITIES, rarity_counts)},
+        "coins_per_pull":      round(coins_per_pull, 2),
+        "coins_per_cost":      round(coins_per_pull / cost, 4),
+        "item_value_per_pull": round(items_total / total, 2),
+        "net_sink_per_pull":   round(cost - coins_per_pull, 2),
+        "pulls_to_ssr": {
+            "mean":          round(float((np.arange(ssr_pity + 1) * pmf).sum()), 2) if known else None,
+            "p50":           pct(0.5),
+            "p90":           pct(0.9),
+            "p99":           pct(0.99),
+            "hard_pity_pct": round(100 * float(pmf[ssr_pity]), 2) if known else None,
+            "completed":     hits,
+            "censored":      int((pity_ssr > 0).sum()),
+            "pmf":           pmf.tolist(),
+        },
+    }
+
+
+if __name__ == "__main__":
+    args   = [int(a) for a in sys.argv[1:4]]
+    report = simulate(*args)
+    report["pulls_to_ssr"].pop("pmf")
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,54 @@
+"""
+WowoCash Leaderboard Index
+
+A sorted list of (-value, uid) entries kept in step with the economy, so
+leaderboards and "your rank" lookups never sort the whole user set. Lookups
+are a bisect (O(log n)); an update moves one entry (a C-level memmove).
+"""
+
+import threading
+from bisect import bisect_left, insort
+
+
+class RankIndex:
+    def __init__(self):
+        self._entries: list[tuple[int, str]] = []   # (-value, uid), best first
+        self._value:   dict[str, int]         = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, values: dict[str, int]):
+        """Replace the index with {uid: value} in one sort."""
+        with self._lock:
+            self._value   = dict(values)
+            self._entries = sorted((-v, uid) for uid, v in self._value.items())
+
+    def update(self, uid: str, value: int):
+        with self._lock:
+            old = self._value.get(uid)
+            if old == value:
+                return
+            if old is not None:
+                del self._entries[bisect_left(self._entries, (-old, uid))]
+            self._value[uid] = value
+            insort(self._entries, (-value, uid))
+
+    def top(self, n: int, offset: int = 0) -> list[tuple[str, int]]:
+        """[(uid, value), ...] for ranks offset+1 .. offset+n."""
+        with self._lock:
+            return [(uid, -neg) for neg, uid in self._entries[offset:offset + n]]
+
+    def position(self, uid: str, value: int) -> int:
+        """1-based rank uid would have with value, without indexing it."""
+        with self._lock:
+            return bisect_left(self._entries, (-value, uid)) + 1
+
+    def rank(self, uid: str) -> int | None:
+        """1-based rank, or None if the user isn't indexed."""
+        with self._lock:
+            value = self._value.get(uid)
+            if value is None:
+                return None
+            return bisect_left(self._entries, (-value, uid)) + 1
@@ -0,0 +1,150 @@
+"""
+WowoCash Ledger — complete transaction history in cold storage
+
+Every balance change is appended to data/ledger.db, separate from the economy
+itself, so the user record only carries its last 30 transactions (txlog.py)
+while /wowo_history can page through everything.
+
+Rows are never updated or deleted. Pages are keyset seeks on
+(user_id, [kind,] ts, id), so page 500 costs the same as page 1. Appends are
+buffered and written in batches by a GroupCommitter of their own.
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from economy.store import GroupCommitter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    id      INTEGER PRIMARY KEY,
+    user_id TEXT    NOT NULL,
+    ts      INTEGER NOT NULL,
+    amount  INTEGER NOT NULL,
+    kind    TEXT    NOT NULL,
+    note    TEXT    NOT NULL,
+    args    TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_user      ON ledger (user_id, ts, id);
+CREATE INDEX IF NOT EXISTS idx_ledger_user_kind ON ledger (user_id, kind, ts, id);
+"""
+
+def _row(uid: str, entry: tuple, kind: str) -> tuple:
+    amount, ts, note, *args = entry
+    return (uid, ts, amount, kind, note, json.dumps(args, ensure_ascii=False))
+
+
+class Ledger:
+    def __init__(self, path: Path, commit_window: float = 0.5):
+        self.path      = path
+        self.conn: sqlite3.Connection | None = None
+        self.committer = GroupCommitter(self.flush, commit_window)
+        self._lock     = threading.Lock()    # guards conn
+        self._buf_lock = threading.Lock()    # guards _buf; never held across a write
+        self._buf: list[tuple] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            atexit.register(self.flush)
+        return self.conn
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._connect().execute("SELECT 1 FROM ledger LIMIT 1").fetchone() is None
+
+    # ── Append ────────────────────────────────────────────────────────────────
+
+    def append(self, uid: str, entry: tuple, kind: str):
+        """entry is a txlog tuple (amount, ts, note, *args)."""
+        row = _row(uid, entry, kind)
+        with self._buf_lock:
+            self._buf.append(row)
+        self.committer.request()
+
+    def flush(self) -> int:
+        with self._lock:
+            with self._buf_lock:
+                rows, self._buf = self._buf, []
+            if not rows:
+                return 0
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO ledger (user_id, ts, amount, kind, note, args) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            except Exception:
+                with self._buf_lock:
+                    self._buf = rows + self._buf
+                raise
+            return len(rows)
+
+    def backfill(self, entries):
+        """Seed an empty ledger with (uid, entry, kind) triples, e.g. from the
+        users' recent-transaction rings."""
+        rows = [_row(uid, entry, kind) for uid, entry, kind in entries]
+        rows.sort(key=lambda r: r[1])
+        with self._buf_lock:
+            self._buf.extend(rows)
+        self.flush()
+
+    # ── Read ──────────────────────────────────────────────────────────────────
+
+    def page(self, uid: str, limit: int, kind: str | None = None,
+             since: int | None = None, until: int | None = None,
+             before: tuple[int, int] | None = None) -> list[tuple]:
+        """
+        Newest-first rows (id, ts, amount, kind, note, args) for one user.
+        since/until bound ts (inclusive/exclusive); before is the (ts, id) of
+        the last row of the previous page.
+
+        Rows still waiting for their batch are merged in from the buffer
+        rather than flushed. They get the ids the next flush will give them
+        (rowids continue from the current maximum, in buffer order), so a
+        cursor taken from one stays valid once it is written.
+        """
+        sql    = "SELECT id, ts, amount, kind, note, args FROM ledger WHERE user_id = ?"
+        params = [uid]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if since is not None:
+            sql += " AND ts >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND ts < ?"
+            params.append(until)
+        if before is not None:
+            sql += " AND (ts, id) < (?, ?)"
+            params.extend(before)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:   # no flush in flight: the buffer is exactly what isn't written
+            conn = self._connect()
+            rows = conn.execute(sql, params).fetchall()
+            with self._buf_lock:
+                pending = list(self._buf)
+            if pending:
+                top = conn.execute("SELECT max(id) FROM ledger").fetchone()[0] or 0
+        if pending:
+            rows.extend(
+                (top + 1 + n, ts, amount, k, note, args)
+                for n, (row_uid, ts, amount, k, note, args) in enumerate(pending)
+                if row_uid == uid
+                and (kind is None or k == kind)
+                and (since is None or ts >= since)
+                and (until is None or ts < until)
+                and (before is None or (ts, top + 1 + n) < tuple(before))
+            )
+            rows.sort(key=lambda r: (r[1], r[0]), reverse=True)
+            del rows[limit:]
+        return [(i, ts, amount, k, note, json.loads(args)) for i, ts, amount, k, note, args in rows]
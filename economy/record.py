@@ -0,0 +1,293 @@
+"""
+WowoCash user records
+
+A resident user is a UserRecord rather than a nested dict: one __slots__
+object whose small integer sections are packed, with their field names held
+once on the class instead of as keys in every user's dicts.
+
+    stats, gacha   one array("q") each, a machine int per field
+    inventory      counts in an array("I") by position in Inventory.ITEMS
+    daily          two slots
+    transactions   a txlog.TxRing once first used: fixed-width entries in
+                   one bytearray, args as compact JSON bytes
+
+Keys outside a section's fixed schema (a retired stat, a field written by a
+newer version) go to that object's small overflow dict and are written back
+by to_json(), so loading never drops or rejects them.
+
+Every section keeps the dict-style access the engine already uses
+(user["stats"]["games_won"] += 1, user["inventory"].get(item, 0), ...), and
+to_json() gives back the on-disk shape, so backends and the journal see
+exactly what they saw before.
+
+Whole-file writes (JsonBackend) cache each record's encoded JSON until the
+store touches it again, so a write only re-encodes users that changed.
+"""
+
+import json
+from array import array
+
+
+def encode(obj):
+    """json.dumps default: sections to dicts, transaction rings to lists."""
+    if isinstance(obj, Section):
+        return obj.to_json()
+    return list(obj)
+
+
+class Section:
+    """
+    Dict-style reads and writes on top of __getitem__/__setitem__/keys().
+    Subclasses keep keys outside their schema in an _other slot.
+    """
+    __slots__ = ()
+
+    def _get_other(self, key):
+        if self._other is not None and key in self._other:
+            return self._other[key]
+        raise KeyError(key)
+
+    def _set_other(self, key, value):
+        if self._other is None:
+            self._other = {}
+        self._other[key] = value
+
+    def _keys(self, fields) -> tuple:
+        return fields if self._other is None else (*fields, *self._other)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return self[key]
+
+    def update(self, other):
+        for key, value in dict(other).items():
+            self[key] = value
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def items(self) -> list:
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self) -> list:
+        return [self[key] for key in self.keys()]
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    to_json = copy
+
+    def __eq__(self, other) -> bool:
+        return self.copy() == (other.copy() if isinstance(other, Section) else other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.copy()!r})"
+
+# ─── Sections ─────────────────────────────────────────────────────────────────
+
+class Counters(Section):
+    """A fixed set of integer fields packed into one array("q")."""
+    __slots__ = ("_v", "_other")
+    FIELDS: tuple[str, ...] = ()
+
+    def __init_subclass__(cls):
+        cls._INDEX = {name: i for i, name in enumerate(cls.FIELDS)}
+
+    def __init__(self, values=None):
+        self._v     = array("q", bytes(8 * len(self.FIELDS)))
+        self._other = None
+        if values:
+            self.update(values)
+
+    def __getitem__(self, key) -> int:
+        i = self._INDEX.get(key)
+        return self._get_other(key) if i is None else self._v[i]
+
+    def __setitem__(self, key, value: int):
+        i = self._INDEX.get(key)
+        if i is None:
+            self._set_other(key, value)
+        else:
+            self._v[i] = value
+
+    def keys(self) -> tuple:
+        return self._keys(self.FIELDS)
+
+
+class Stats(Counters):
+    FIELDS = ("games_played", "games_won", "games_survived", "votes_cast", "transfers_sent", "gacha_pulls")
+
+
+class Gacha(Counters):
+    FIELDS = ("total_pulls", "pity_sr", "pity_ssr", "lucky_charm")
+
+
+class Daily(Section):
+    __slots__ = ("last_claim", "streak", "_other")
+    FIELDS    = __slots__[:-1]
+
+    def __init__(self, values=None):
+        self.last_claim = None
+        self.streak     = 0
+        self._other     = None
+        if values:
+            self.update(values)
+
+    def __getitem__(self, key):
+        if key not in Daily.FIELDS:
+            return self._get_other(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in Daily.FIELDS:
+            self._set_other(key, value)
+        else:
+            setattr(self, key, value)
+
+    def keys(self) -> tuple:
+        return self._keys(Daily.FIELDS)
+
+
+class Inventory(Section):
+    """
+    Item counts by position in ITEMS (the shop's item ids, set by the engine
+    through use_items). A count of 0 means not owned. Ids outside ITEMS,
+    e.g. retired items, go to a small overflow dict.
+    """
+    __slots__ = ("_v", "_other")
+    ITEMS:  tuple[str, ...] = ()
+    _INDEX: dict[str, int]  = {}
+
+    @classmethod
+    def use_items(cls, item_ids):
+        cls.ITEMS  = tuple(item_ids)
+        cls._INDEX = {iid: i for i, iid in enumerate(cls.ITEMS)}
+
+    def __init__(self, counts=None):
+        self._v     = array("I", bytes(4 * len(self.ITEMS)))
+        self._other = None
+        if counts:
+            self.update(counts)
+
+    def __getitem__(self, key) -> int:
+        i = self._INDEX.get(key)
+        if i is None:
+            return self._get_other(key)
+        if not self._v[i]:
+            raise KeyError(key)
+        return self._v[i]
+
+    def __setitem__(self, key, count: int):
+        i = self._INDEX.get(key)
+        if i is None:
+            self._set_other(key, count)
+        else:
+            self._v[i] = count
+
+    def keys(self) -> list:
+        owned = [self.ITEMS[i] for i, n in enumerate(self._v) if n]
+        if self._other:
+            owned.extend(self._other)
+        return owned
+
+# ─── Record ───────────────────────────────────────────────────────────────────
+
+class UserRecord(Section):
+    __slots__ = (
+        "id", "username", "balance", "lifetime", "transactions", "inventory",
+        "daily", "gacha", "missions", "stats", "cooldowns", "missions_done", "_other", "_json",
+    )
+    FIELDS   = __slots__[:-3]     # missions_done and _json are derived, never stored; _other holds unknown keys
+    SECTIONS = {"inventory": Inventory, "daily": Daily, "gacha": Gacha, "stats": Stats}
+
+    def __init__(self, values: dict):
+        self.id            = ""
+        self.username      = ""
+        self.balance       = 0
+        self.lifetime      = 0
+        self.transactions  = []
+        self.inventory     = Inventory()
+        self.daily         = Daily()
+        self.gacha         = Gacha()
+        self.missions      = {"daily": {}, "weekly": {}}
+        self.stats         = Stats()
+        self.cooldowns     = None       # most users never work/rob; None until first use
+        self.missions_done = None       # scope → (period, done-mission mask); filled by the engine
+        self._other        = None
+        self._json         = None
+        self.update(values)
+
+    def __getitem__(self, key):
+        if key not in UserRecord.FIELDS:
+            return self._get_other(key)
+        value = getattr(self, key)
+        if value is None and key == "cooldowns":
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in UserRecord.FIELDS:
+            self._set_other(key, value)
+            return
+        section = UserRecord.SECTIONS.get(key)
+        if section and not isinstance(value, section):
+            value = section(value)
+        setattr(self, key, value)
+
+    def keys(self) -> tuple:
+        return self._keys(self.FIELDS if self.cooldowns is not None else self.FIELDS[:-1])
+
+    def to_json(self) -> dict:
+        """The on-disk dict. Sections stay objects; dump with default=encode."""
+        out = {key: getattr(self, key) for key in self.FIELDS if key != "cooldowns" or self.cooldowns is not None}
+        if self._other:
+            out.update(self._other)
+        return out
+
+    def touch(self):
+        """Drop the cached encoding; the store calls this whenever the user changes."""
+        self._json = None
+
+    def encoded(self, cache: bool = False) -> str:
+        text = self._json
+        if text is None:
+            text = json.dumps(self.to_json(), ensure_ascii=False, separators=(",", ":"), default=encode)
+            if cache:
+                self._json = text
+        return text
+
+
+def dump_economy(data: dict, cache: bool = False) -> str:
+    """
+    The whole economy as compact JSON. Records reuse their cached encoding
+    (and keep it, with cache=True); plain dicts are encoded as they are.
+    """
+    users = ",".join(
+        json.dumps(uid, ensure_ascii=False) + ":" + (
+            user.encoded(cache) if isinstance(user, UserRecord)
+            else json.dumps(user, ensure_ascii=False, separators=(",", ":"), default=encode)
+        )
+        for uid, user in data["users"].items()
+    )
+    rest = json.dumps({k: v for k, v in data.items() if k != "users"},
+                      ensure_ascii=False, separators=(",", ":"), default=encode)
+    return '{"users":{' + users + "}" + ("," + rest[1:] if len(rest) > 2 else "}")
@@ -0,0 +1,56 @@
+"""
+WowoCash period rollover
+
+Daily claims and missions are keyed by the local day ("2025-01-31") and ISO
+week ("2025-W05"). PeriodClock works both out once per period instead of
+on every call. It keeps the next period precomputed and swaps it in as one
+object when the boundary passes. A call made at 00:00:00 on a Monday can
+therefore never see the new day with last week's id, and the herd of
+/wowo_daily calls right after midnight costs one float comparison each.
+
+This is deliberately all there is to the rollover. Mission skeletons need
+no per-period precomputing: a new period's counters are a copy of the
+engine's fixed _MISSION_ZERO lists. Claim writes get no queue of their
+own either: they are coalesced by the store's GroupCommitter like every
+other save (python -m economy.bench daily_burst shows the batch sizes).
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+
+class Period(NamedTuple):
+    day:       str     # local date, ISO
+    week:      str     # ISO week, "YYYY-Www"
+    yesterday: str     # previous day, for daily streaks
+    ends:      float   # epoch seconds of the next local midnight
+
+def period_of(d: date) -> Period:
+    year, week, _ = d.isocalendar()
+    ends = datetime.combine(d + timedelta(days=1), datetime.min.time()).timestamp()
+    return Period(d.isoformat(), f"{year}-W{week:02d}", (d - timedelta(days=1)).isoformat(), ends)
+
+
+class PeriodClock:
+    def __init__(self, now=time.time):
+        self._now    = now
+        self._lock   = threading.Lock()
+        self.current = period_of(date.fromtimestamp(now()))
+        self._next   = period_of(date.fromisoformat(self.current.day) + timedelta(days=1))
+
+    def get(self) -> Period:
+        """The current period, switching to the precomputed next one once its boundary has passed."""
+        period = self.current
+        if self._now() < period.ends:
+            return period
+        with self._lock:
+            now = self._now()
+            if now >= self.current.ends:
+                if now < self._next.ends:
+                    self.current = self._next
+                else:   # slept through more than a day
+                    self.current = period_of(date.fromtimestamp(now))
+                self._next = period_of(date.fromisoformat(self.current.day) + timedelta(days=1))
+            return self.current
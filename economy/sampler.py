@@ -0,0 +1,51 @@
+"""
+WowoCash weighted sampling — Walker/Vose alias tables
+
+An AliasTable is built once from a list of weights; each draw after that is
+one random() call, one multiply and one table lookup, whatever the number
+of outcomes. The engine keeps one table per gacha state (normal,
+lucky charm, SR pity, SSR pity) instead of rebuilding a pool and weight
+list for every pull.
+"""
+
+import random
+
+
+class AliasTable:
+    __slots__ = ("n", "prob", "alias")
+
+    def __init__(self, weights):
+        weights = [float(w) for w in weights]
+        total   = sum(weights)
+        if not weights or total <= 0:
+            raise ValueError("alias table needs at least one positive weight")
+        n      = len(weights)
+        scaled = [w * n / total for w in weights]
+        prob   = [1.0] * n
+        alias  = list(range(n))
+        small  = [i for i, p in enumerate(scaled) if p < 1.0]
+        large  = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l     = small.pop(), large.pop()
+            prob[s]  = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding and keeps prob 1.0.
+        self.n     = n
+        self.prob  = prob
+        self.alias = alias
+
+    def sample(self, rand=random.random) -> int:
+        """Index of one outcome, drawn with probability weight / total."""
+        u = rand() * self.n
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def probabilities(self) -> list[float]:
+        """The distribution the table draws from (for checks and odds displays)."""
+        p = [0.0] * self.n
+        for i in range(self.n):
+            p[i]             += self.prob[i] / self.n
+            p[self.alias[i]] += (1.0 - self.prob[i]) / self.n
+        return p
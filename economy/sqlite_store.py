@@ -0,0 +1,345 @@
+"""
+WowoCash Storage Layer — SQLite backend
+
+One row per user plus indexed child tables (inventory, cooldowns, mission
+progress, transactions), so writing back a dirty user touches only that
+user's rows instead of the whole economy. Runs in WAL mode.
+
+Enable with WOWO_BACKEND=sqlite. On first start with an empty database the
+existing wowocash.json is migrated automatically; to migrate by hand:
+
+    python -m economy.sqlite_store [data/wowocash.json] [data/database.db]
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from economy import txlog
+from economy.store import JsonBackend, empty_economy
+from economy.txlog import TX_KEEP
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    id                TEXT PRIMARY KEY,
+    username          TEXT    NOT NULL DEFAULT '',
+    balance           INTEGER NOT NULL DEFAULT 0,
+    lifetime          INTEGER NOT NULL DEFAULT 0,
+    daily_last_claim  TEXT,
+    daily_streak      INTEGER NOT NULL DEFAULT 0,
+    gacha_total_pulls INTEGER NOT NULL DEFAULT 0,
+    gacha_pity_sr     INTEGER NOT NULL DEFAULT 0,
+    gacha_pity_ssr    INTEGER NOT NULL DEFAULT 0,
+    gacha_lucky_charm INTEGER NOT NULL DEFAULT 0,
+    games_played      INTEGER NOT NULL DEFAULT 0,
+    games_won         INTEGER NOT NULL DEFAULT 0,
+    games_survived    INTEGER NOT NULL DEFAULT 0,
+    votes_cast        INTEGER NOT NULL DEFAULT 0,
+    transfers_sent    INTEGER NOT NULL DEFAULT 0,
+    gacha_pulls       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_users_balance ON users (balance DESC);
+CREATE TABLE IF NOT EXISTS inventory (
+    user_id TEXT    NOT NULL,
+    item    TEXT    NOT NULL,
+    count   INTEGER NOT NULL,
+    PRIMARY KEY (user_id, item)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cooldowns (
+    user_id   TEXT NOT NULL,
+    kind      TEXT NOT NULL,
+    last_used TEXT NOT NULL,
+    PRIMARY KEY (user_id, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS mission_progress (
+    user_id  TEXT    NOT NULL,
+    scope    TEXT    NOT NULL,
+    period   TEXT    NOT NULL,
+    mission  TEXT    NOT NULL,
+    progress INTEGER NOT NULL,
+    PRIMARY KEY (user_id, scope, period, mission)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS transactions (
+    user_id TEXT    NOT NULL,
+    seq     INTEGER NOT NULL,
+    amount  INTEGER NOT NULL,
+    ts      INTEGER NOT NULL,
+    note    TEXT    NOT NULL,
+    args    TEXT    NOT NULL,
+    PRIMARY KEY (user_id, seq)
+) WITHOUT ROWID;
+"""
+
+def _upgrade(conn: sqlite3.Connection):
+    """Convert a transactions table with formatted notes/timestamps (no args
+    column) to the txlog encoding."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+    if not cols or "args" in cols:
+        return
+    with conn:
+        conn.execute("ALTER TABLE transactions RENAME TO transactions_old")
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, 'legacy', ?)",
+            [
+                (uid, seq, amount, txlog.legacy_ts(ts), json.dumps([note], ensure_ascii=False))
+                for uid, seq, amount, note, ts in conn.execute(
+                    "SELECT user_id, seq, amount, note, ts FROM transactions_old"
+                )
+            ],
+        )
+        conn.execute("DROP TABLE transactions_old")
+
+# (column, section in the user dict or None for top level, key)
+_USER_COLUMNS = [
+    ("username",          None,    "username"),
+    ("balance",           None,    "balance"),
+    ("lifetime",          None,    "lifetime"),
+    ("daily_last_claim",  "daily", "last_claim"),
+    ("daily_streak",      "daily", "streak"),
+    ("gacha_total_pulls", "gacha", "total_pulls"),
+    ("gacha_pity_sr",     "gacha", "pity_sr"),
+    ("gacha_pity_ssr",    "gacha", "pity_ssr"),
+    ("gacha_lucky_charm", "gacha", "lucky_charm"),
+    ("games_played",      "stats", "games_played"),
+    ("games_won",         "stats", "games_won"),
+    ("games_survived",    "stats", "games_survived"),
+    ("votes_cast",        "stats", "votes_cast"),
+    ("transfers_sent",    "stats", "transfers_sent"),
+    ("gacha_pulls",       "stats", "gacha_pulls"),
+]
+
+_COLS       = ", ".join(c for c, _, _ in _USER_COLUMNS)
+_UPSERT_SQL = (
+    f"INSERT INTO users (id, {_COLS}) VALUES (?{', ?' * len(_USER_COLUMNS)}) "
+    f"ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c, _, _ in _USER_COLUMNS)
+)
+
+# Every table holding a user's rows, with its user id column.
+_USER_TABLES = [
+    ("users", "id"), ("inventory", "user_id"), ("cooldowns", "user_id"),
+    ("mission_progress", "user_id"), ("transactions", "user_id"),
+]
+
+
+def _user_row(uid: str, user: dict) -> tuple:
+    row = [uid]
+    for col, section, key in _USER_COLUMNS:
+        if section is None:
+            row.append(user.get(key, "" if key == "username" else 0))
+        else:
+            row.append(user.get(section, {}).get(key, None if key == "last_claim" else 0))
+    return tuple(row)
+
+def _user_from_row(row: tuple) -> dict:
+    user = {
+        "id": row[0], "transactions": [], "inventory": {},
+        "daily": {}, "gacha": {}, "missions": {"daily": {}, "weekly": {}}, "stats": {},
+    }
+    for (col, section, key), value in zip(_USER_COLUMNS, row[1:]):
+        if section is None:
+            user[key] = value
+        else:
+            user[section][key] = value
+    return user
+
+def _inventory_rows(user: dict) -> tuple:
+    return tuple(sorted(user.get("inventory", {}).items()))
+
+def _cooldown_rows(user: dict) -> tuple:
+    return tuple(sorted(user.get("cooldowns", {}).items()))
+
+def _mission_rows(user: dict) -> tuple:
+    rows = []
+    for scope, slot in user.get("missions", {}).items():
+        if "period" in slot:
+            # Current period only; mission is the counter's position.
+            rows.extend((scope, slot["period"], str(i), n) for i, n in enumerate(slot["progress"]))
+        else:
+            # Date-keyed dicts not yet rolled over by the engine.
+            rows.extend(
+                (scope, period, mission, progress)
+                for period, missions in slot.items()
+                for mission, progress in missions.items()
+            )
+    return tuple(sorted(rows))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# BACKEND
+# ══════════════════════════════════════════════════════════════════════════════
+
+class SqliteBackend:
+    def __init__(self, path: Path, migrate_from: Path | None = None):
+        self.path         = path
+        self.migrate_from = migrate_from
+        self.conn: sqlite3.Connection | None = None
+        # Last state written per user, so unchanged child tables are skipped
+        # and only new transactions are inserted.
+        self._written: dict[str, dict] = {}
+        self._meta_json = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            _upgrade(self.conn)
+            self.conn.executescript(SCHEMA)
+        return self.conn
+
+    # ── Load ──────────────────────────────────────────────────────────────────
+
+    def load(self) -> dict:
+        conn = self._connect()
+        empty = conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+        if empty and self.migrate_from and self.migrate_from.exists():
+            data = JsonBackend(self.migrate_from).load()
+            for user in data["users"].values():
+                txlog.ring(user)
+            self.write(data, set(data["users"]))
+            print(f"[WowoCash] Migrated {len(data['users'])} users from {self.migrate_from.name} to SQLite")
+            return data
+
+        data  = empty_economy()
+        users = data["users"]
+        for row in conn.execute(f"SELECT id, {_COLS} FROM users"):
+            users[row[0]] = _user_from_row(row)
+        for uid, item, count in conn.execute("SELECT user_id, item, count FROM inventory"):
+            users[uid]["inventory"][item] = count
+        for uid, kind, last_used in conn.execute("SELECT user_id, kind, last_used FROM cooldowns"):
+            # Epoch seconds come back as text from the TEXT column; older rows hold ISO strings.
+            users[uid].setdefault("cooldowns", {})[kind] = int(last_used) if last_used.isdigit() else last_used
+        for uid, scope, period, mission, progress in conn.execute(
+            "SELECT user_id, scope, period, mission, progress FROM mission_progress"
+        ):
+            missions = users[uid]["missions"]
+            if mission.isdigit():
+                slot   = missions.setdefault(scope, {})
+                counts = slot.setdefault("progress", [])
+                counts.extend([0] * (int(mission) + 1 - len(counts)))
+                counts[int(mission)] = progress
+                slot["period"] = period
+            else:
+                missions.setdefault(scope, {}).setdefault(period, {})[mission] = progress
+
+        seqs = {}
+        for uid, seq, amount, ts, note, args in conn.execute(
+            "SELECT user_id, seq, amount, ts, note, args FROM transactions ORDER BY user_id, seq DESC"
+        ):
+            txs = users[uid]["transactions"]
+            if len(txs) < TX_KEEP:
+                txs.append((amount, ts, sys.intern(note), *json.loads(args)))
+            seqs.setdefault(uid, seq)
+        for user in users.values():
+            user["transactions"] = txlog.TxRing(user["transactions"])
+
+        for key, value in conn.execute("SELECT key, value FROM meta"):
+            data["meta"][key] = json.loads(value)
+        self._meta_json = json.dumps(data["meta"], sort_keys=True)
+
+        for uid, user in users.items():
+            self._remember(uid, user, seqs.get(uid, 0))
+        return data
+
+    def _remember(self, uid: str, user: dict, tx_seq: int):
+        self._written[uid] = {
+            "inventory": _inventory_rows(user),
+            "cooldowns": _cooldown_rows(user),
+            "missions":  _mission_rows(user),
+            "tx_mark":   txlog.mark(user["transactions"]),
+            "tx_seq":    tx_seq,
+        }
+
+    # ── Write ─────────────────────────────────────────────────────────────────
+
+    def write(self, data: dict, dirty: set[str]):
+        conn  = self._connect()
+        users = data["users"]
+        with conn:
+            for uid in dirty:
+                user = users.get(uid)
+                if user is None:
+                    # Evicted to the cold tier (coldstore.py).
+                    for table, col in _USER_TABLES:
+                        conn.execute(f"DELETE FROM {table} WHERE {col} = ?", (uid,))
+                    self._written.pop(uid, None)
+                    continue
+                conn.execute(_UPSERT_SQL, _user_row(uid, user))
+                self._write_children(conn, uid, user)
+
+            meta_json = json.dumps(data.get("meta", {}), sort_keys=True)
+            if meta_json != self._meta_json:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [(k, json.dumps(v)) for k, v in data.get("meta", {}).items()],
+                )
+                self._meta_json = meta_json
+
+    def _write_children(self, conn: sqlite3.Connection, uid: str, user: dict):
+        written = self._written.setdefault(
+            uid, {"inventory": (), "cooldowns": (), "missions": (), "tx_mark": None, "tx_seq": 0},
+        )
+
+        rows = _inventory_rows(user)
+        if rows != written["inventory"]:
+            conn.execute("DELETE FROM inventory WHERE user_id = ?", (uid,))
+            conn.executemany("INSERT INTO inventory VALUES (?, ?, ?)", [(uid, *r) for r in rows])
+            written["inventory"] = rows
+
+        rows = _cooldown_rows(user)
+        if rows != written["cooldowns"]:
+            conn.execute("DELETE FROM cooldowns WHERE user_id = ?", (uid,))
+            conn.executemany("INSERT INTO cooldowns VALUES (?, ?, ?)", [(uid, *r) for r in rows])
+            written["cooldowns"] = rows
+
+        rows = _mission_rows(user)
+        if rows != written["missions"]:
+            conn.execute("DELETE FROM mission_progress WHERE user_id = ?", (uid,))
+            conn.executemany("INSERT INTO mission_progress VALUES (?, ?, ?, ?, ?)", [(uid, *r) for r in rows])
+            written["missions"] = rows
+
+        # Transactions are newest-first; the ring's seq says how many were
+        # added since the last write. Counting rather than comparing matters
+        # because two identical notes in the same second are still two
+        # transactions.
+        txs = user.get("transactions", [])
+        new = txlog.newer(txs, written["tx_mark"])
+        if new:
+            seq = written["tx_seq"]
+            for amount, ts, note, *args in reversed(new):
+                seq += 1
+                conn.execute(
+                    "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+                    (uid, seq, amount, ts, note, json.dumps(args, ensure_ascii=False)),
+                )
+            conn.execute("DELETE FROM transactions WHERE user_id = ? AND seq <= ?", (uid, seq - TX_KEEP))
+            written["tx_seq"]  = seq
+        written["tx_mark"] = txlog.mark(txs)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MIGRATION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def migrate_json(json_path: Path, db_path: Path) -> int:
+    """Copy every user from the JSON file into an empty SQLite database."""
+    backend = SqliteBackend(db_path)
+    conn    = backend._connect()
+    if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None:
+        raise RuntimeError(f"{db_path} already has users; refusing to migrate twice")
+    data = JsonBackend(json_path).load()
+    backend.write(data, set(data["users"]))
+    return len(data["users"])
+
+
+if __name__ == "__main__":
+    data_dir = Path(__file__).parent.parent / "data"
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else data_dir / "wowocash.json"
+    dst = Path(sys.argv[2]) if len(sys.argv) > 2 else data_dir / "database.db"
+    print(f"Migrated {migrate_json(src, dst)} users: {src} -> {dst}")
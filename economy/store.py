@@ -0,0 +1,566 @@
+"""
+WowoCash Storage Layer — process-resident user store
+
+The economy is loaded once from a backend, kept in memory, and written back
+only when something changed. Engine functions mark users dirty; saves that
+land within the commit window share one durable write (group commit), and an
+exit hook flushes whatever is left.
+
+With a ColdStore attached, dormant users can be evicted from memory and the
+backend (evict) and come back on their next lookup (get); see coldstore.py.
+
+Backends:
+  JournalBackend — data/wowocash.json snapshot + append-only delta journal
+  JsonBackend    — data/wowocash.json, whole file per write
+  SqliteBackend  — data/database.db, one row set per dirty user (sqlite_store.py)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+from economy.record import UserRecord, dump_economy, encode
+
+
+def empty_economy() -> dict:
+    return {"users": {}, "meta": {"version": 1}}
+
+def atomic_write(path: Path, payload: str):
+    """Write to a temp file, fsync it, then rename over `path`.
+
+    A crash or full disk mid-write leaves the previous file intact.
+    """
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    # Persist the rename itself (not possible on Windows).
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# JSON BACKEND
+# ══════════════════════════════════════════════════════════════════════════════
+
+class JsonBackend:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> dict:
+        self.path.parent.mkdir(exist_ok=True)
+        if not self.path.exists():
+            return empty_economy()
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def write(self, data: dict, dirty: set[str]):
+        # A JSON blob can't be patched in place, so every write is the full
+        # file, but records keep their encoding between writes and only the
+        # users touched since the last one are re-encoded. Compact output
+        # lets json use its C encoder (indent=2 forces the pure-Python path
+        # and roughly triples the file size).
+        atomic_write(self.path, dump_economy(data, cache=True))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# JOURNAL BACKEND
+# ══════════════════════════════════════════════════════════════════════════════
+
+class JournalBackend(JsonBackend):
+    """
+    The JSON file becomes a snapshot; changes are appended to a journal as
+    compact delta records (one JSON array per line) built by the engine.
+    Startup replays the journal over the snapshot with `replay(users, record)`.
+    Once the journal passes `max_bytes`, compact() folds it into a new
+    snapshot.
+
+    Journals are numbered generations (wowocash.journal.<n>). The snapshot
+    stores the generation it was taken at, so a crash between writing the
+    snapshot and deleting old journals never replays a delta twice.
+    """
+
+    def __init__(self, path: Path, journal_path: Path, replay, max_bytes: int):
+        super().__init__(path)
+        self.journal_path = journal_path
+        self.replay       = replay
+        self.max_bytes    = max_bytes
+        self.gen          = 0
+        self._buf: list[str] = []
+        self._file        = None
+        self._size        = 0
+
+    def _gen_path(self, gen: int) -> Path:
+        return self.journal_path.with_name(f"{self.journal_path.name}.{gen}")
+
+    def _generations(self) -> list[int]:
+        gens = []
+        for p in self.journal_path.parent.glob(f"{self.journal_path.name}.*"):
+            suffix = p.name.rsplit(".", 1)[1]
+            if suffix.isdigit():
+                gens.append(int(suffix))
+        return sorted(gens)
+
+    def _open(self):
+        if self._file:
+            self._file.close()
+        self._file = open(self._gen_path(self.gen), "ab")
+        self._size = self._file.tell()
+
+    # ── Load ──────────────────────────────────────────────────────────────────
+
+    def load(self) -> dict:
+        data = super().load()
+        base = data["meta"].get("journal_gen", 0)
+        self.gen = base
+        for gen in self._generations():
+            path = self._gen_path(gen)
+            if gen < base:
+                path.unlink(missing_ok=True)   # already folded into the snapshot
+                continue
+            self._replay_file(data["users"], path)
+            self.gen = gen
+        self._open()
+        return data
+
+    def _replay_file(self, users: dict, path: Path):
+        good = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break                      # torn tail from a crash mid-append
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.replay(users, record)
+                good += len(line)
+        if good < path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(good)
+
+    # ── Append ────────────────────────────────────────────────────────────────
+
+    def log(self, line: str):
+        self._buf.append(line)
+
+    def write(self, data: dict, dirty: set[str]):
+        if not self._buf:
+            return
+        buf, self._buf = self._buf, []
+        chunk = ("\n".join(buf) + "\n").encode("utf-8")
+        try:
+            self._file.write(chunk)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception:
+            self._file.truncate(self._size)
+            self._buf = buf + self._buf
+            raise
+        self._size += len(chunk)
+
+    # ── Compaction ────────────────────────────────────────────────────────────
+
+    def wants_compaction(self) -> bool:
+        return self._size > self.max_bytes
+
+    def compact(self, data: dict, lock):
+        with lock:
+            # Buffered deltas belong to the generation being folded.
+            self.write(data, set())
+            self.gen += 1
+            self._open()
+            data["meta"]["journal_gen"] = self.gen
+            payload = dump_economy(data)
+        atomic_write(self.path, payload)
+        for gen in self._generations():
+            if gen < self.gen:
+                self._gen_path(gen).unlink(missing_ok=True)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# GROUP COMMIT
+# ══════════════════════════════════════════════════════════════════════════════
+
+class GroupCommitter:
+    """
+    Coalesces commit requests into batches. The first request opens a batch,
+    the batch stays open for `window` seconds, then one write covers every
+    request that arrived meanwhile. Requests made while a write is running
+    go into the next batch.
+    """
+
+    def __init__(self, write, window: float):
+        self.window  = window
+        self._write  = write
+        self._cond   = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+        self._pending = 0        # requests in the open batch
+        self._opened  = 0.0      # monotonic time the open batch got its first request
+        self._urgent  = False    # close the open batch without waiting out the window
+        self._next    = 1        # id of the batch currently collecting requests
+        self._done    = 0        # id of the last finished batch
+        self._failed: tuple[int, Exception] | None = None
+
+        self._commits       = 0
+        self._requests      = 0
+        self._last_batch    = 0
+        self._max_batch     = 0
+        self._last_latency  = 0.0
+        self._total_latency = 0.0
+        self._max_latency   = 0.0
+        self._recent: dict[int, tuple[int, float]] = {}   # batch id → (size, latency), last RECENT
+
+    RECENT = 64
+
+    def request(self, wait: bool = False, urgent: bool = False) -> dict | None:
+        """
+        Ask for a durable write. With wait=True, block until it is on disk
+        and return the write that covered it: {"batch": requests in it,
+        "latency_ms": first request → durable}.
+        """
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="wowo-commit", daemon=True)
+                self._thread.start()
+            if self._pending == 0:
+                self._opened = time.monotonic()
+            self._pending += 1
+            self._urgent   = self._urgent or urgent
+            batch = self._next
+            self._cond.notify_all()
+            if not wait:
+                return
+            while self._done < batch:
+                self._cond.wait()
+            if self._failed and self._failed[0] == batch:
+                raise self._failed[1]
+            size, latency = self._recent.get(batch, (0, 0.0))
+            return {"batch": size, "latency_ms": round(latency * 1000, 2)}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending == 0:
+                    self._cond.wait()
+                deadline = self._opened + self.window
+                while not self._urgent and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                batch, size, opened = self._next, self._pending, self._opened
+                self._next   += 1
+                self._pending = 0
+                self._urgent  = False
+
+            error = None
+            try:
+                self._write()
+            except Exception as e:
+                error = e
+                print(f"[WowoCash] Commit failed: {e}")
+
+            with self._cond:
+                latency = time.monotonic() - opened
+                self._done           = batch
+                self._failed         = (batch, error) if error else None
+                self._commits       += 1
+                self._requests      += size
+                self._last_batch     = size
+                self._max_batch      = max(self._max_batch, size)
+                self._last_latency   = latency
+                self._total_latency += latency
+                self._max_latency    = max(self._max_latency, latency)
+                self._recent[batch]  = (size, latency)
+                self._recent.pop(batch - self.RECENT, None)
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Batch sizes (requests per write) and latency (first request → durable)."""
+        with self._cond:
+            commits = self._commits or 1
+            return {
+                "window_ms":       round(self.window * 1000, 1),
+                "commits":         self._commits,
+                "requests":        self._requests,
+                "last_batch":      self._last_batch,
+                "avg_batch":       round(self._requests / commits, 2),
+                "max_batch":       self._max_batch,
+                "last_latency_ms": round(self._last_latency * 1000, 2),
+                "avg_latency_ms":  round(self._total_latency / commits * 1000, 2),
+                "max_latency_ms":  round(self._max_latency * 1000, 2),
+            }
+
+# ══════════════════════════════════════════════════════════════════════════════
+# USER STORE
+# ══════════════════════════════════════════════════════════════════════════════
+
+class UserStore:
+    """
+    Tiering writes two journal records of its own, which the engine's replay
+    must handle: ["u", uid, <whole record>] when a user is rehydrated and
+    ["x", uid] when one is evicted.
+    """
+
+    def __init__(self, backend, commit_window: float = 0.5, cold=None):
+        self.backend   = backend
+        self.cold      = cold
+        self.data: dict | None = None
+        self.dirty: set[str]   = set()
+        self.lock      = threading.RLock()
+        self.committer = GroupCommitter(self.flush, commit_window)
+        self.journaled = hasattr(backend, "log")
+        self._compacting = False
+
+        self._user_locks: "weakref.WeakValueDictionary[str, threading.RLock]" = weakref.WeakValueDictionary()
+        self._local    = threading.local()        # .tx: the open transaction on this thread
+        self._quiet    = threading.Condition(self.lock)
+        self._active   = 0                        # transactions between their first and last change
+        self._draining = 0                        # snapshots waiting for _active to reach 0
+
+        self._evicted          = 0
+        self._rehydrated       = 0
+        self._last_rehydrate   = 0.0
+        self._total_rehydrate  = 0.0
+        self._max_rehydrate    = 0.0
+
+    # ── Loading ───────────────────────────────────────────────────────────────
+
+    def load(self) -> dict:
+        """Load the economy on first use, then serve the resident copy."""
+        if self.data is None:
+            with self.lock:
+                if self.data is None:
+                    data  = self.backend.load()
+                    users = data["users"]
+                    for uid, user in users.items():
+                        if not isinstance(user, UserRecord):
+                            users[uid] = UserRecord(user)
+                    if self.cold is not None:
+                        self.cold.load(users)
+                    self.data = data
+                    atexit.register(self.flush)
+        return self.data
+
+    @property
+    def users(self) -> dict:
+        return self.load()["users"]
+
+    # ── Records ───────────────────────────────────────────────────────────────
+
+    def get(self, uid: str) -> dict | None:
+        user = self.users.get(uid)
+        if user is None and self.cold is not None and uid in self.cold:
+            user = self._rehydrate(uid)
+        return user
+
+    def put(self, uid: str, user: dict):
+        # Under the lock: flush() encodes data["users"] while holding it, and
+        # a new key mid-iteration would break that.
+        users = self.users
+        with self.lock:
+            users[uid] = user
+        self.mark_dirty(uid)
+
+    def _touch(self, uid: str):
+        # Under the lock, so a write caching this user's encoding can't keep
+        # it across the change.
+        with self.lock:
+            user = self.data["users"].get(uid) if self.data else None
+            if user is not None and isinstance(user, UserRecord):
+                user.touch()
+
+    def mark_dirty(self, uid: str):
+        self._touch(uid)
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            tx["dirty"].add(uid)
+            return
+        self.dirty.add(uid)
+        self.committer.request()
+
+    def log(self, op: str, uid: str, *args):
+        """Record a delta for the journal backend. No-op for other backends."""
+        self._touch(uid)
+        if not self.journaled:
+            return
+        line = json.dumps([op, uid, *args], ensure_ascii=False, separators=(",", ":"), default=encode)
+        tx   = getattr(self._local, "tx", None)
+        if tx is not None:
+            tx["records"].append(line)
+            tx["dirty"].add(uid)
+            return
+        with self.lock:
+            self.backend.log(line)
+            self.dirty.add(uid)
+
+    # ── Tiers ─────────────────────────────────────────────────────────────────
+
+    def _rehydrate(self, uid: str) -> dict | None:
+        with self.lock:
+            user = self.data["users"].get(uid)
+            if user is not None:
+                return user                       # another thread got here first
+            start = time.perf_counter()
+            body  = self.cold.take(uid)
+            if body is None:
+                return None
+            user = self.data["users"][uid] = UserRecord(body)
+            # The backend dropped this user on eviction; write it back whole.
+            self.log("u", uid, user.to_json())
+            self.mark_dirty(uid)
+            latency = time.perf_counter() - start
+            self._rehydrated      += 1
+            self._last_rehydrate   = latency
+            self._total_rehydrate += latency
+            self._max_rehydrate    = max(self._max_rehydrate, latency)
+        return user
+
+    def evict(self, uids, summary, last_active) -> int:
+        """
+        Move resident users to the cold tier: their records go to the cold
+        segment first, then they are dropped from memory and from the backend
+        in one transaction. summary(user) is what stays answerable while cold
+        (see summary()). Callers must keep the users from changing meanwhile.
+        """
+        users = self.users
+        with self.transaction(*uids):
+            batch = [(uid, users[uid]) for uid in uids if uid in users]
+            self.cold.put((uid, last_active(u), summary(u), u.encoded()) for uid, u in batch)
+            for uid, _ in batch:
+                del users[uid]
+                self.log("x", uid)
+                self.mark_dirty(uid)
+        with self.lock:
+            self._evicted += len(batch)
+        return len(batch)
+
+    def summary(self, uid: str) -> dict | None:
+        """The resident record, else the cold summary. Never rehydrates."""
+        user = self.users.get(uid)
+        if user is None and self.cold is not None:
+            user = self.cold.summary(uid)
+        return user
+
+    def summaries(self) -> list[tuple[str, dict]]:
+        """[(uid, summary), ...] for every cold user."""
+        return self.cold.summaries() if self.cold is not None else []
+
+    def tier_stats(self) -> dict:
+        """Hot/cold user counts and rehydration latency (cold lookup → resident)."""
+        with self.lock:
+            rehydrated = self._rehydrated or 1
+            return {
+                "hot":                len(self.users),
+                "cold":               len(self.cold) if self.cold is not None else 0,
+                "evicted":            self._evicted,
+                "rehydrated":         self._rehydrated,
+                "last_rehydrate_ms":  round(self._last_rehydrate * 1000, 2),
+                "avg_rehydrate_ms":   round(self._total_rehydrate / rehydrated * 1000, 2),
+                "max_rehydrate_ms":   round(self._max_rehydrate * 1000, 2),
+            }
+
+    # ── Transactions ──────────────────────────────────────────────────────────
+
+    def _user_lock(self, uid: str) -> threading.RLock:
+        with self.lock:
+            lock = self._user_locks.get(uid)
+            if lock is None:
+                lock = self._user_locks[uid] = threading.RLock()
+            return lock
+
+    @contextmanager
+    def transaction(self, *uids: str):
+        """
+        Lock the given users (in sorted order, so two transactions can't
+        deadlock) and commit every change made inside the block as one unit:
+        snapshots never see it half-applied and its journal records land as a
+        single line. There is no rollback — validate before mutating.
+        """
+        if getattr(self._local, "tx", None) is not None:
+            raise RuntimeError("transactions can't be nested")
+        locks = [self._user_lock(uid) for uid in sorted(set(uids))]
+        for lock in locks:
+            lock.acquire()
+        tx = {"dirty": set(), "records": []}
+        try:
+            with self.lock:
+                while self._draining:
+                    self._quiet.wait()
+                self._active += 1
+            self._local.tx = tx
+            try:
+                yield
+            finally:
+                self._local.tx = None
+                with self.lock:
+                    if tx["records"]:
+                        self.backend.log('["t",[' + ",".join(tx["records"]) + "]]")
+                    self.dirty |= tx["dirty"]
+                    self._active -= 1
+                    self._quiet.notify_all()
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        if tx["dirty"]:
+            self.committer.request()
+
+    @contextmanager
+    def _quiescent(self):
+        """Hold the store lock with no transaction half-applied."""
+        with self.lock:
+            self._draining += 1
+            try:
+                while self._active:
+                    self._quiet.wait()
+                yield
+            finally:
+                self._draining -= 1
+                self._quiet.notify_all()
+
+    # ── Write-back ────────────────────────────────────────────────────────────
+
+    def commit(self) -> dict:
+        """Block until every change made so far is durable; the covering
+        write's batch size and latency (GroupCommitter.request)."""
+        return self.committer.request(wait=True, urgent=True)
+
+    def flush(self) -> int:
+        """Write the economy back if any user is dirty. Returns the dirty count."""
+        with self._quiescent():
+            if self.data is None or not self.dirty:
+                return 0
+            pending    = self.dirty
+            self.dirty = set()
+            try:
+                self.backend.write(self.data, pending)
+            except Exception:
+                self.dirty |= pending
+                raise
+        self._maybe_compact()
+        return len(pending)
+
+    def _maybe_compact(self):
+        if not self.journaled or self._compacting or not self.backend.wants_compaction():
+            return
+        self._compacting = True
+        threading.Thread(target=self._compact, name="wowo-compact", daemon=True).start()
+
+    def _compact(self):
+        try:
+            self.backend.compact(self.data, self._quiescent())
+        except Exception as e:
+            print(f"[WowoCash] Journal compaction failed: {e}")
+        finally:
+            self._compacting = False
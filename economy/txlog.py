@@ -0,0 +1,141 @@
+"""
+WowoCash recent-transaction ring
+
+Each user keeps their last TX_KEEP transactions in a TxRing, newest first,
+so recording one overwrites the oldest entry in place instead of shifting
+and re-slicing a list.
+
+An entry is a flat tuple (amount, ts, note, *args): ts is epoch seconds and
+note is a key into the engine's TX_NOTES templates, rendered with args only
+when displayed. On disk it is the same tuple as a JSON array.
+
+In memory the ring is packed rather than a container of tuples:
+
+    amount, ts, note   18 bytes per entry in one bytearray; note is a code
+                       into a process-wide table of note keys
+    args               one compact JSON bytes object per entry, None if empty
+
+Iterating or indexing a ring gives back the entry tuples. Its seq counts the
+entries added since it was built, so a backend can tell which are new
+(mark/newer) without holding on to entry objects.
+
+Entries written before the ring existed ({"amount", "note", "ts"} dicts with
+a formatted note and "YYYY-MM-DD HH:MM UTC" timestamp) are converted the
+first time the user is touched, under the "legacy" note key.
+"""
+
+import json
+import struct
+import sys
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+
+TX_KEEP = 30
+
+def legacy_ts(ts: str) -> int:
+    return int(datetime.strptime(ts, "%Y-%m-%d %H:%M UTC").replace(tzinfo=timezone.utc).timestamp())
+
+def decode(entry) -> tuple:
+    if isinstance(entry, tuple):
+        return entry
+    if isinstance(entry, dict):
+        return (entry["amount"], legacy_ts(entry["ts"]), "legacy", entry["note"])
+    amount, ts, note, *args = entry
+    return (amount, ts, sys.intern(note), *args)
+
+# ─── Packed ring ──────────────────────────────────────────────────────────────
+
+_FIXED = struct.Struct("<qqH")     # amount, ts, note code
+
+# Note keys by code. Codes only live in memory, so new keys are added as seen.
+_NOTES:     list[str]      = []
+_NOTE_CODE: dict[str, int] = {}
+_notes_lock = threading.Lock()
+
+def _note_code(note: str) -> int:
+    code = _NOTE_CODE.get(note)
+    if code is None:
+        with _notes_lock:
+            code = _NOTE_CODE.get(note)
+            if code is None:
+                code = _NOTE_CODE[note] = len(_NOTES)
+                _NOTES.append(sys.intern(note))
+    return code
+
+
+class TxRing:
+    """Up to TX_KEEP entries, newest first, with deque-style appendleft."""
+    __slots__ = ("_fixed", "_args", "_head", "seq")
+
+    def __init__(self, entries=()):
+        self._fixed = bytearray()
+        self._args: list[bytes | None] = []
+        self._head  = 0               # slot of the oldest entry once full
+        self.seq    = 0
+        for entry in reversed(list(islice(entries, TX_KEEP))):
+            self.appendleft(decode(entry))
+        self.seq    = 0
+
+    def appendleft(self, entry: tuple):
+        amount, ts, note, *args = entry
+        fixed = _FIXED.pack(amount, ts, _note_code(note))
+        args  = json.dumps(args, ensure_ascii=False, separators=(",", ":")).encode() if args else None
+        n     = len(self._args)
+        if n < TX_KEEP:
+            self._fixed += fixed
+            self._args.append(args)
+        else:
+            i = self._head
+            self._fixed[i * _FIXED.size:(i + 1) * _FIXED.size] = fixed
+            self._args[i] = args
+            self._head    = (i + 1) % n
+        self.seq += 1
+
+    def _entry(self, slot: int) -> tuple:
+        amount, ts, code = _FIXED.unpack_from(self._fixed, slot * _FIXED.size)
+        args = self._args[slot]
+        return (amount, ts, _NOTES[code], *json.loads(args)) if args else (amount, ts, _NOTES[code])
+
+    def __getitem__(self, k: int) -> tuple:
+        n = len(self._args)
+        return self._entry((self._head - 1 - range(n)[k]) % n)
+
+    def __iter__(self):
+        n, head = len(self._args), self._head
+        for k in range(n):
+            yield self._entry((head - 1 - k) % n)
+
+    def __len__(self) -> int:
+        return len(self._args)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TxRing, list)):
+            return list(self) == [decode(e) for e in other]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TxRing({list(self)!r})"
+
+
+def ring(user: dict) -> TxRing:
+    """The user's transaction ring, converting a freshly loaded list on first use."""
+    txs = user["transactions"]
+    if not isinstance(txs, TxRing):
+        txs = user["transactions"] = TxRing(txs)
+    return txs
+
+def mark(txs):
+    """Where txs stands now; newer(txs, mark) later gives what was added since."""
+    return (txs, txs.seq if isinstance(txs, TxRing) else None)
+
+def newer(txs, since) -> list[tuple]:
+    """Entries of txs added after the mark since, newest first. All of them
+    when txs has been replaced (or converted) since then, or since is None."""
+    if since is not None and since[0] is txs:
+        if not isinstance(txs, TxRing):
+            return []         # a list is converted to a ring before it changes
+        return list(islice(txs, min(txs.seq - since[1], len(txs))))
+    return list(map(decode, txs))
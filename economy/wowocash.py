@@ -2,15 +2,43 @@
 WowoCash Economy Engine - Fixed Version
 """
 
-import json
+import collections
+import copy
+import itertools
+import os
 import random
-from datetime import datetime, date, timedelta
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from economy import txlog
+from economy.coldstore import ColdStore
+from economy.cooldowns import CooldownIndex
+from economy.gacha_odds import GachaOdds
+from economy.leaderboard import RankIndex
+from economy.ledger import Ledger
+from economy.record import Inventory, UserRecord
+from economy.rollover import PeriodClock
+from economy.sampler import AliasTable
+from economy.store import JournalBackend, JsonBackend, UserStore
+
 # ─── Paths ────────────────────────────────────────────────────────────────────
 
-DATA_DIR  = Path(__file__).parent.parent / "data"
-DATA_FILE = DATA_DIR / "wowocash.json"
+DATA_DIR     = Path(os.getenv("WOWO_DATA_DIR", Path(__file__).parent.parent / "data"))
+DATA_FILE    = DATA_DIR / "wowocash.json"
+JOURNAL_FILE = DATA_DIR / "wowocash.journal"
+DB_FILE      = DATA_DIR / "database.db"
+LEDGER_FILE  = DATA_DIR / "ledger.db"
+COLD_FILE    = DATA_DIR / "wowocash.cold.db"
+
+# ─── Storage ──────────────────────────────────────────────────────────────────
+
+BACKEND          = os.getenv("WOWO_BACKEND", "journal")             # "journal" | "json" | "sqlite"
+COMMIT_WINDOW_MS = int(os.getenv("WOWO_COMMIT_WINDOW_MS", "500"))  # saves within this window share one write
+JOURNAL_MAX_KB   = int(os.getenv("WOWO_JOURNAL_MAX_KB", "8192"))   # compact the journal past this size
+COLD_AFTER_DAYS  = int(os.getenv("WOWO_COLD_AFTER_DAYS", "60"))    # idle users move to the cold tier; 0 = never
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
@@ -22,9 +50,51 @@ TRANSFER_FEE_PCT   = 0.05
 GACHA_PULL_COST    = 150
 GACHA_PITY_LIMIT   = 50
 GACHA_SSR_PITY     = 100
+GACHA_LUCKY_BOOST  = 20    # added to every SSR weight while a lucky charm is active
 
 RARITY_EMOJI = {"N": "⚪", "R": "🔵", "SR": "🟣", "SSR": "🌟"}
 
+# Transaction notes: stored as (key, *args), rendered only for display.
+TX_NOTES = {
+    "daily":        "Daily login (streak {})",
+    "mission_d":    "Misi harian selesai: {}",
+    "mission_w":    "Misi mingguan selesai: {}",
+    "gacha":        "Gacha x{}",
+    "gacha_prize":  "Gacha: {}",
+    "gacha_prizes": "Hadiah koin gacha x{}",
+    "transfer_out": "Transfer ke {} (fee {})",
+    "transfer_in":  "Diterima dari {}",
+    "buy":          "Beli {} x{}",
+    "game":         "Game reward",
+    "work":         "Kerja sebagai {}",
+    "hourly":       "Hourly reward",
+    "rob":          "Merampok {}",
+    "robbed":       "Dirampok oleh {}",
+    "rob_fine":     "Ketahuan merampok {} (denda)",
+    "coinflip":     "Coin flip: {} {:,}",
+    "dice":         "Dice: {} (roll {})",
+    "slots":        "Slots {} x{}",
+    "number":       "Number guess {}",
+    "bj_bet":       "Blackjack bet {:,}",
+    "bj_win":       "Blackjack win x{}",
+    "bj_push":      "Blackjack push (refund)",
+    "rr_bet":       "Russian Roulette bet",
+    "rr_win":       "Russian Roulette menang (pot {:,})",
+    "legacy":       "{}",
+}
+
+# /wowo_history filters: kind → note keys. Anything unlisted is "other".
+TX_KINDS = {
+    "casino":   ("coinflip", "dice", "slots", "number", "bj_bet", "bj_win", "bj_push", "rr_bet", "rr_win"),
+    "transfer": ("transfer_out", "transfer_in"),
+    "gacha":    ("gacha", "gacha_prize", "gacha_prizes"),
+    "mission":  ("mission_d", "mission_w"),
+    "income":   ("daily", "work", "hourly", "game"),
+    "rob":      ("rob", "robbed", "rob_fine"),
+    "shop":     ("buy",),
+}
+_TX_KIND = {note: kind for kind, notes in TX_KINDS.items() for note in notes}
+
 WW_REWARDS = {
     "win":          200,
     "lose":          50,
@@ -36,17 +106,17 @@ WW_REWARDS = {
 SHOP_ITEMS = {
     "role_hint": {
         "id": "role_hint", "name": "📜 Role Hint",
-        "description": "Reveal satu pemain secara acak di awal game berikutnya (hanya untukmu).",
+        "description": "Reveal satu pemain secara acak di awal game (pilih lewat /ww_use, hanya untukmu).",
         "price": 300, "max_stack": 5, "category": "game",
     },
     "double_vote": {
         "id": "double_vote", "name": "🗳️ Double Vote",
-        "description": "Vote-mu dihitung 2x pada 1 voting siang. Satu kali pakai.",
+        "description": "Vote-mu dihitung 2x pada 1 voting siang (pilih lewat /ww_use). Terpakai saat kamu vote.",
         "price": 500, "max_stack": 3, "category": "game",
     },
     "shield": {
         "id": "shield", "name": "🛡️ Shield",
-        "description": "Sekali dalam sebuah game, selamat dari 1 serangan malam.",
+        "description": "Sekali dalam sebuah game, selamat dari 1 serangan malam (pilih lewat /ww_use). Terpakai hanya jika menyelamatkanmu.",
         "price": 750, "max_stack": 2, "category": "game",
     },
     "gacha_ticket": {
@@ -66,6 +136,8 @@ SHOP_ITEMS = {
     },
 }
 
+Inventory.use_items(SHOP_ITEMS)   # resident inventories count items by shop position
+
 GACHA_POOL = [
     {"rarity": "N",   "type": "coins", "amount": 50,   "label": "50 WowoCash",   "weight": 35},
     {"rarity": "N",   "type": "coins", "amount": 100,  "label": "100 WowoCash",  "weight": 25},
@@ -103,6 +175,7 @@ WEEKLY_MISSIONS = [
 COOLDOWN_WORK   = 3600
 COOLDOWN_ROB    = 7200
 COOLDOWN_HOURLY = 3600
+COOLDOWNS       = {"work": COOLDOWN_WORK, "hourly": COOLDOWN_HOURLY, "rob": COOLDOWN_ROB}
 
 # ─── Work jobs ────────────────────────────────────────────────────────────────
 WORK_JOBS = [
@@ -138,30 +211,54 @@ SLOT_PAYOUTS = {
 # DATA LAYER
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _load() -> dict:
-    DATA_DIR.mkdir(exist_ok=True)
-    if not DATA_FILE.exists():
-        DATA_FILE.write_text(json.dumps({"users": {}, "meta": {"version": 1}}, indent=2))
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _make_backend():
+    if BACKEND == "sqlite":
+        from economy.sqlite_store import SqliteBackend
+        return SqliteBackend(DB_FILE, migrate_from=DATA_FILE)
+    if BACKEND == "json":
+        return JsonBackend(DATA_FILE)
+    return JournalBackend(DATA_FILE, JOURNAL_FILE, replay=_replay, max_bytes=JOURNAL_MAX_KB * 1024)
 
-def _save(data: dict):
-    DATA_DIR.mkdir(exist_ok=True)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def _load() -> dict:
+    """Resident economy data. Parsed from disk, and a new ledger seeded
+    from it, only on first call."""
+    data = _store.load()
+    if not _ledger_ready:
+        _seed_ledger()
+    return data
+
+def load():
+    """Load the economy and seed the ledger. The bot calls this at startup
+    so no command pays for it."""
+    _load()
+
+def flush() -> int:
+    """Write dirty users (and pending ledger rows) to disk right now. Used at shutdown."""
+    _get_ledger().flush()
+    return _store.flush()
+
+def commit_stats() -> dict:
+    """Group-commit metrics: requests per write and request→durable latency."""
+    return _store.committer.stats()
+
+def tier_stats() -> dict:
+    """Hot/cold user counts, evictions and rehydration latency."""
+    return _store.tier_stats()
+
+# Current day/week ids, switched atomically at local midnight.
+_clock = PeriodClock()
 
 def _today() -> str:
-    return date.today().isoformat()
+    return _clock.get().day
 
 def _week() -> str:
-    d = date.today()
-    return f"{d.isocalendar()[0]}-W{d.isocalendar()[1]:02d}"
+    return _clock.get().week
 
-def _now_ts() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+def _now_ts() -> int:
+    return int(time.time())
 
-def _default_user(uid: str, username: str) -> dict:
-    return {
+def _default_user(uid: str, username: str) -> UserRecord:
+    return UserRecord({
         "id": uid, "username": username,
         "balance": 0, "lifetime": 0,
         "transactions": [],
@@ -173,85 +270,370 @@ def _default_user(uid: str, username: str) -> dict:
             "games_played": 0, "games_won": 0, "games_survived": 0,
             "votes_cast": 0, "transfers_sent": 0, "gacha_pulls": 0,
         },
-    }
+    })
+
+# Leaderboards: key (dotted path into the user record) → label. Each one gets
+# a RankIndex; adding a leaderboard is one line here.
+LEADERBOARD_KEYS = {
+    "balance":              "💰 Saldo",
+    "lifetime":             "📈 Total Diperoleh",
+    "stats.games_won":      "🏆 Game Menang",
+    "stats.games_survived": "💪 Survive",
+    "stats.gacha_pulls":    "🎰 Gacha Pulls",
+    "daily.streak":         "🔥 Daily Streak",
+}
 
 def get_user(user_id: int, username: str = "") -> dict:
-    data = _load()
+    """
+    The user's record, or a fresh default that isn't stored until its first
+    change (_ensure_stored), so looking someone up never writes (except to
+    bring a cold user back into memory). A changed display name is updated
+    in memory and reaches disk with the user's next save.
+    """
     uid  = str(user_id)
-    if uid not in data["users"]:
-        data["users"][uid] = _default_user(uid, username)
-        _save(data)
-    elif username and data["users"][uid]["username"] != username:
-        data["users"][uid]["username"] = username
-        _save(data)
-    return data["users"][uid]
+    user = _store.get(uid)
+    if user is None:
+        return _default_user(uid, username)
+    if username and user["username"] != username:
+        user["username"] = username
+    return user
+
+def _ensure_stored(user: dict):
+    """
+    Store a fresh default from get_user, whole, before its first delta is
+    journaled. Replay then never depends on a later "u" to create the user,
+    and the ledger never holds rows for a user who isn't stored.
+    """
+    uid = user["id"]
+    if _store.users.get(uid) is user:
+        return
+    _store.log("u", uid, user.to_json())
+    _store.put(uid, user)
+    if _ranks_ready:
+        _reindex(user)
 
 def _save_user(user_id: int, user_data: dict):
-    data = _load()
-    data["users"][str(user_id)] = user_data
-    _save(data)
+    uid = str(user_id)
+    # Small scalar sections go to the journal whole; balance, inventory,
+    # cooldowns and missions are journaled as deltas where they change.
+    _store.log("u", uid, {
+        "username": user_data["username"],
+        "daily":    user_data["daily"],
+        "gacha":    user_data["gacha"],
+        "stats":    user_data["stats"],
+    })
+    _store.put(uid, user_data)
+    if _ranks_ready:
+        _reindex(user_data)
+
+@contextmanager
+def transaction(*members):
+    """
+    Atomic multi-user update. Members are user ids or (user_id, username) pairs:
+
+        with transaction((a_id, a_name), b_id) as (a, b):
+            ...
+
+    The users are locked in a fixed order and everything changed inside the
+    block is committed as one write. Check balances before touching anything:
+    there is no rollback.
+    """
+    members = [m if isinstance(m, tuple) else (m, "") for m in members]
+    with _store.transaction(*(str(uid) for uid, _ in members)):
+        yield tuple(get_user(uid, uname) for uid, uname in members)
+
+def get_users(members) -> dict:
+    """
+    {uid: record} for many users in one locked pass (ids or (user_id, username)
+    pairs, as for transaction). The records are copies, safe to read from
+    another thread; change users through update_users.
+    """
+    with transaction(*members) as users:
+        return {u["id"]: copy.deepcopy(u) for u in users}
+
+def update_users(mapping: dict) -> dict:
+    """
+    Apply changes to many users and commit them as one write. mapping is
+    {user_id or (user_id, username): changes} where changes may hold
 
-def _add_balance(user: dict, amount: int, note: str) -> dict:
-    """Add/subtract balance and log transaction. Mutates and returns user dict."""
+        "balance": (amount, note_key, *args)   # as for _add_balance
+        "items":   {item_id: delta}
+
+    All or nothing: if any balance or item count would go below zero nobody
+    is changed and "short" lists who fell short.
+    """
+    members = list(mapping)
+    with transaction(*members) as users:
+        changes = [mapping[m] for m in members]
+        short   = [
+            u["username"] or u["id"] for u, ch in zip(users, changes)
+            if u["balance"] + ch.get("balance", (0,))[0] < 0
+            or any(u["inventory"].get(iid, 0) + d < 0 for iid, d in ch.get("items", {}).items())
+        ]
+        if short:
+            return {"success": False, "short": short}
+        for u, ch in zip(users, changes):
+            if "balance" in ch:
+                u = _add_balance(u, *ch["balance"])
+            for iid, delta in ch.get("items", {}).items():
+                _set_item(u, iid, u["inventory"].get(iid, 0) + delta)
+            _save_user(u["id"], u)
+    return {
+        "success": True,
+        "users":   {u["id"]: {"balance": u["balance"], "inventory": dict(u["inventory"])} for u in users},
+    }
+
+def _apply_balance(user: dict, entry: tuple):
+    amount = entry[0]
     user["balance"] = max(0, user["balance"] + amount)
     if amount > 0:
         user["lifetime"] += amount
-    user["transactions"].insert(0, {"amount": amount, "note": note, "ts": _now_ts()})
-    user["transactions"] = user["transactions"][:30]
+    txlog.ring(user).appendleft(entry)
+
+def _add_balance(user: dict, amount: int, note: str, *args) -> dict:
+    """Add/subtract balance and log transaction (note is a TX_NOTES key).
+    Mutates and returns user dict."""
+    entry = (amount, _now_ts(), note, *args)
+    # Balance deltas aren't idempotent: apply and journal them under the
+    # store lock so a compaction snapshot can't land in between.
+    with _store.lock:
+        _ensure_stored(user)
+        _apply_balance(user, entry)
+        _store.log("b", user["id"], *entry)
+        if _ledger_ready:
+            _ledger.append(user["id"], entry, _TX_KIND.get(note, "other"))
+        else:
+            _ledger_pending.append((user["id"], entry))
+        if _ranks_ready:
+            _reindex(user, ("balance", "lifetime"))
     return user
 
+def _set_item(user: dict, item_id: str, count: int):
+    _ensure_stored(user)
+    user["inventory"][item_id] = count
+    _store.log("i", user["id"], item_id, count)
+
+def _replay(users: dict, record: list):
+    """Re-apply one journal record written by _save_user/_add_balance/_set_item/
+    _set_cooldown/_progress or the store's tiering ("x", whole-record "u"),
+    or a transaction ("t") grouping several."""
+    if record[0] == "t":
+        for sub in record[1]:
+            _replay(users, sub)
+        return
+    op, uid, *args = record
+    if op == "x":
+        users.pop(uid, None)   # evicted to the cold tier
+        return
+    user = users.get(uid)
+    if user is None:
+        user = users[uid] = _default_user(uid, "")
+    if op == "b":
+        if isinstance(args[1], str):
+            # Written before notes were templated: amount, note, formatted ts.
+            args = [args[0], txlog.legacy_ts(args[2]), "legacy", args[1]]
+        _apply_balance(user, txlog.decode(args))
+    elif op == "i":
+        user["inventory"][args[0]] = args[1]
+    elif op == "c":
+        user.setdefault("cooldowns", {})[args[0]] = args[1]
+    elif op == "m":
+        scope, period, mission, progress = args
+        bit = _MISSION_BIT[scope].get(mission)
+        if bit is not None:   # None: mission since removed
+            _mission_counts(user, scope, period)[bit] = progress
+    elif op == "u":
+        user.update(args[0])
+
+_store = UserStore(_make_backend(), commit_window=COMMIT_WINDOW_MS / 1000, cold=ColdStore(COLD_FILE))
+
+# One RankIndex per LEADERBOARD_KEYS entry, built from the resident data on
+# first use and then kept current by _add_balance and _save_user.
+_ranks       = {key: RankIndex() for key in LEADERBOARD_KEYS}
+_ranks_ready = False
+
+def _board_value(user: dict, key: str) -> int:
+    value = user
+    for part in key.split("."):
+        value = value[part]
+    return value
+
+# Full history lives in the ledger; a new ledger is seeded from the rings at
+# startup (_load). Until it is, _add_balance parks entries in
+# _ledger_pending instead of touching SQLite under the store lock.
+_ledger         = Ledger(LEDGER_FILE, commit_window=COMMIT_WINDOW_MS / 1000)
+_ledger_ready   = False
+_ledger_pending: list[tuple[str, tuple]] = []
+_ledger_seeding = threading.Lock()
+
+def _seed_ledger():
+    """
+    Make the ledger ready. An empty one is seeded from every resident
+    user's ring; only the snapshot is taken under the store lock, the
+    SQLite reads and writes happen outside it.
+    """
+    global _ledger_ready
+    with _ledger_seeding:
+        if _ledger_ready:
+            return
+        empty = _ledger.is_empty()
+        with _store.lock:
+            pending = _ledger_pending.copy()
+            _ledger_pending.clear()
+            if empty:
+                # Parked entries are in the rings too; count each one once.
+                parked = collections.Counter(pending)
+                rows   = []
+                for uid, u in _store.users.items():
+                    for entry in map(txlog.decode, u["transactions"]):
+                        if parked[uid, entry]:
+                            parked[uid, entry] -= 1
+                        else:
+                            rows.append((uid, entry))
+                rows += pending
+            _ledger_ready = True
+        if empty:
+            _ledger.backfill((uid, entry, _TX_KIND.get(entry[2], "other")) for uid, entry in rows)
+        else:
+            for uid, entry in pending:
+                _ledger.append(uid, entry, _TX_KIND.get(entry[2], "other"))
+
+def _get_ledger() -> Ledger:
+    if not _ledger_ready:
+        _seed_ledger()
+    return _ledger
+
+def _rank_index(key: str = "balance") -> RankIndex:
+    global _ranks_ready
+    if not _ranks_ready:
+        with _store.lock:
+            if not _ranks_ready:
+                users = list(_store.users.items())
+                cold  = _store.summaries()
+                for k, index in _ranks.items():
+                    values = {uid: s.get(k, 0) for uid, s in cold}
+                    values.update((uid, _board_value(u, k)) for uid, u in users)
+                    index.build(values)
+                _ranks_ready = True
+    return _ranks[key]
+
+def _reindex(user: dict, keys=LEADERBOARD_KEYS):
+    for key in keys:
+        _ranks[key].update(user["id"], _board_value(user, key))
+
+# Users idle for COLD_AFTER_DAYS leave memory for the cold tier (coldstore.py)
+# and come back on their next get_user. A user's summary keeps them on the
+# leaderboards meanwhile.
+
+def _last_active(user: dict) -> int:
+    """Epoch second of the user's newest transaction or daily claim, 0 if none."""
+    txs  = user["transactions"]
+    last = txlog.decode(txs[0])[1] if txs else 0
+    if user["daily"]["last_claim"]:
+        last = max(last, _day_start(user["daily"]["last_claim"]))
+    return last
+
+def _cold_summary(user: dict) -> dict:
+    return {"username": user["username"], **{key: _board_value(user, key) for key in LEADERBOARD_KEYS}}
+
+def dormant_users() -> list[str]:
+    """Ids of resident users idle past COLD_AFTER_DAYS."""
+    if not COLD_AFTER_DAYS:
+        return []
+    cutoff = _now_ts() - COLD_AFTER_DAYS * 86400
+    return [uid for uid, u in list(_store.users.items()) if _last_active(u) < cutoff]
+
+def evict_users(user_ids) -> int:
+    """Move those of user_ids that are still dormant to the cold tier. Returns how many moved."""
+    cutoff = _now_ts() - COLD_AFTER_DAYS * 86400
+    _get_ledger()   # seeding a new ledger has to see them while they are resident
+    uids = [
+        uid for uid in map(str, user_ids)
+        if (u := _store.users.get(uid)) is not None and _last_active(u) < cutoff
+    ]
+    return _store.evict(uids, _cold_summary, _last_active)
+
 # ══════════════════════════════════════════════════════════════════════════════
 # MISSIONS  — fixed: no nested user variable shadowing
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _ensure_missions(user: dict) -> dict:
-    today = _today()
-    week  = _week()
-    if today not in user["missions"]["daily"]:
-        user["missions"]["daily"][today] = {m["id"]: 0 for m in DAILY_MISSIONS}
-        keys = sorted(user["missions"]["daily"].keys())
-        for old in keys[:-7]:
-            del user["missions"]["daily"][old]
-    if week not in user["missions"]["weekly"]:
-        user["missions"]["weekly"][week] = {m["id"]: 0 for m in WEEKLY_MISSIONS}
-        keys = sorted(user["missions"]["weekly"].keys())
-        for old in keys[:-4]:
-            del user["missions"]["weekly"][old]
-    return user
-
-def _progress_mission(user: dict, mission_type: str, amount: int = 1) -> dict:
+# Dispatch table built once: event type → [(scope, bit, mission)]. The bit is
+# the mission's position in its definition list, in the stored counters and
+# in the done mask.
+_MISSION_DEFS = {"daily": (DAILY_MISSIONS, "mission_d"), "weekly": (WEEKLY_MISSIONS, "mission_w")}
+_MISSION_BIT  = {scope: {m["id"]: bit for bit, m in enumerate(defs)} for scope, (defs, _) in _MISSION_DEFS.items()}
+_MISSION_ZERO = {scope: [0] * len(defs) for scope, (defs, _) in _MISSION_DEFS.items()}   # new-period skeleton
+_MISSIONS_BY_TYPE: dict[str, list] = {}
+for _scope, (_defs, _) in _MISSION_DEFS.items():
+    for _bit, _m in enumerate(_defs):
+        _MISSIONS_BY_TYPE.setdefault(_m["type"], []).append((_scope, _bit, _m))
+
+def _mission_counts(user: dict, scope: str, period: str) -> list:
+    """
+    The scope's counters for period, aligned with its mission definitions.
+    Each scope stores only the current period ({"period", "progress"}); a new
+    period resets it on first access. Date-keyed dicts from before keep just
+    the matching period's counts.
+    """
+    slot = user["missions"][scope]
+    if slot.get("period") != period:
+        legacy = None if "period" in slot else slot.get(period)
+        slot   = user["missions"][scope] = {
+            "period":   period,
+            "progress": [legacy.get(m["id"], 0) for m in _MISSION_DEFS[scope][0]] if legacy
+                        else _MISSION_ZERO[scope].copy(),
+        }
+    counts = slot["progress"]
+    if len(counts) < len(_MISSION_DEFS[scope][0]):   # missions added since
+        counts.extend([0] * (len(_MISSION_DEFS[scope][0]) - len(counts)))
+    return counts
+
+def _done_mask(user: dict, scope: str, period: str) -> int:
     """
-    Increment progress for all missions matching type.
-    Fixed: no nested function, no variable shadowing.
+    Mask of the scope's completed missions in period. Cached on the record
+    (missions_done), so it lives and dies with it; derived from the
+    progress counters, never stored.
     """
-    user  = _ensure_missions(user)
-    today = _today()
-    week  = _week()
+    if user.missions_done is None:
+        user.missions_done = {}
+    cached = user.missions_done.get(scope)
+    if cached and cached[0] == period:
+        return cached[1]
+    counts = _mission_counts(user, scope, period)
+    mask   = 0
+    for bit, m in enumerate(_MISSION_DEFS[scope][0]):
+        if counts[bit] >= m["target"]:
+            mask |= 1 << bit
+    user.missions_done[scope] = (period, mask)
+    return mask
+
+def _progress(user: dict, **amounts) -> dict:
+    """
+    Advance missions by event type, several at once:
 
-    # Daily missions
-    for m in DAILY_MISSIONS:
-        if m["type"] != mission_type:
-            continue
-        current = user["missions"]["daily"][today].get(m["id"], 0)
-        if current >= m["target"]:
-            continue
-        new_val = min(current + amount, m["target"])
-        user["missions"]["daily"][today][m["id"]] = new_val
-        if new_val >= m["target"]:
-            user = _add_balance(user, m["reward"], f"Misi harian selesai: {m['name']}")
-
-    # Weekly missions
-    for m in WEEKLY_MISSIONS:
-        if m["type"] != mission_type:
-            continue
-        current = user["missions"]["weekly"][week].get(m["id"], 0)
-        if current >= m["target"]:
-            continue
-        new_val = min(current + amount, m["target"])
-        user["missions"]["weekly"][week][m["id"]] = new_val
-        if new_val >= m["target"]:
-            user = _add_balance(user, m["reward"], f"Misi mingguan selesai: {m['name']}")
+        user = _progress(user, play=1, win=1, survive=1)
 
+    Only the missions listening for those types are visited, and completed
+    ones are skipped on a bit test.
+    """
+    period  = _clock.get()
+    periods = {"daily": period.day, "weekly": period.week}
+    for mtype, amount in amounts.items():
+        if not amount:
+            continue
+        for scope, bit, m in _MISSIONS_BY_TYPE.get(mtype, ()):
+            period = periods[scope]
+            mask   = _done_mask(user, scope, period)
+            if mask & (1 << bit):
+                continue
+            _ensure_stored(user)
+            counts  = _mission_counts(user, scope, period)
+            new_val = min(counts[bit] + amount, m["target"])
+            counts[bit] = new_val
+            _store.log("m", user["id"], scope, period, m["id"], new_val)
+            if new_val >= m["target"]:
+                user.missions_done[scope] = (period, mask | (1 << bit))
+                user = _add_balance(user, m["reward"], _MISSION_DEFS[scope][1], m["name"])
     return user
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -259,26 +641,24 @@ def _progress_mission(user: dict, mission_type: str, amount: int = 1) -> dict:
 # ══════════════════════════════════════════════════════════════════════════════
 
 def claim_daily(user_id: int, username: str) -> dict:
-    user  = get_user(user_id, username)
-    today = _today()
-    last  = user["daily"]["last_claim"]
+    user   = get_user(user_id, username)
+    period = _clock.get()
+    today  = period.day
+    last   = user["daily"]["last_claim"]
 
     if last == today:
-        now      = datetime.utcnow()
-        midnight = datetime(now.year, now.month, now.day) + timedelta(days=1)
-        diff     = midnight - now
-        hrs      = int(diff.total_seconds()) // 3600
-        mins     = (int(diff.total_seconds()) % 3600) // 60
+        secs = int(period.ends - time.time())
+        hrs  = secs // 3600
+        mins = (secs % 3600) // 60
         return {"success": False, "next_in": f"{hrs}j {mins}m", "streak": user["daily"]["streak"]}
 
-    yesterday = (date.today() - timedelta(days=1)).isoformat()
-    streak    = min(user["daily"]["streak"] + 1, DAILY_STREAK_MAX) if last == yesterday else 1
+    streak = min(user["daily"]["streak"] + 1, DAILY_STREAK_MAX) if last == period.yesterday else 1
     reward    = DAILY_BASE + (streak - 1) * DAILY_STREAK_BONUS
 
     user["daily"]["last_claim"] = today
     user["daily"]["streak"]     = streak
-    user = _add_balance(user, reward, f"Daily login (streak {streak})")
-    user = _progress_mission(user, "daily", 1)
+    user = _add_balance(user, reward, "daily", streak)
+    user = _progress(user, daily=1)
 
     _save_user(user_id, user)
     return {"success": True, "reward": reward, "streak": streak}
@@ -288,20 +668,18 @@ def claim_daily(user_id: int, username: str) -> dict:
 # ══════════════════════════════════════════════════════════════════════════════
 
 def get_missions(user_id: int, username: str = "") -> dict:
-    user  = get_user(user_id, username)
-    user  = _ensure_missions(user)
-    today = _today()
-    week  = _week()
-
-    daily_list = []
-    for m in DAILY_MISSIONS:
-        prog = user["missions"]["daily"][today].get(m["id"], 0)
-        daily_list.append({**m, "progress": prog, "done": prog >= m["target"]})
+    user   = get_user(user_id, username)
+    daily  = _mission_counts(user, "daily", _today())
+    weekly = _mission_counts(user, "weekly", _week())
 
-    weekly_list = []
-    for m in WEEKLY_MISSIONS:
-        prog = user["missions"]["weekly"][week].get(m["id"], 0)
-        weekly_list.append({**m, "progress": prog, "done": prog >= m["target"]})
+    daily_list = [
+        {**m, "progress": prog, "done": prog >= m["target"]}
+        for m, prog in zip(DAILY_MISSIONS, daily)
+    ]
+    weekly_list = [
+        {**m, "progress": prog, "done": prog >= m["target"]}
+        for m, prog in zip(WEEKLY_MISSIONS, weekly)
+    ]
 
     return {"daily": daily_list, "weekly": weekly_list, "balance": user["balance"]}
 
@@ -309,75 +687,119 @@ def get_missions(user_id: int, username: str = "") -> dict:
 # GACHA
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _single_pull(user: dict) -> tuple:
-    """Do one pull. Returns (updated_user, result_dict)."""
-    g = user["gacha"]
-    g["total_pulls"]         += 1
-    g["pity_sr"]             += 1
-    g["pity_ssr"]            += 1
-    user["stats"]["gacha_pulls"] += 1
+def _gacha_sampler(entries) -> tuple:
+    entries = tuple(entries)
+    return entries, AliasTable(e["weight"] for e in entries)
 
-    force_ssr = g["pity_ssr"] >= GACHA_SSR_PITY
-    force_sr  = g["pity_sr"]  >= GACHA_PITY_LIMIT
+def gacha_samplers(pool: list = GACHA_POOL, lucky_boost: float = GACHA_LUCKY_BOOST) -> dict:
+    """
+    {state: (entries, AliasTable)} for the four pull states. The engine
+    builds these once (and solves GachaOdds from them); economy.gacha_sim
+    builds them for other pools to try tuning changes.
+    """
+    return {
+        "normal":   _gacha_sampler(pool),
+        "lucky":    _gacha_sampler(
+            {**e, "weight": e["weight"] + lucky_boost} if e["rarity"] == "SSR" else e for e in pool
+        ),
+        "sr_pity":  _gacha_sampler(e for e in pool if e["rarity"] in ("SR", "SSR")),
+        "ssr_pity": _gacha_sampler(e for e in pool if e["rarity"] == "SSR"),
+    }
 
-    if force_ssr:
-        pool = [e for e in GACHA_POOL if e["rarity"] == "SSR"]
-    elif force_sr:
-        pool = [e for e in GACHA_POOL if e["rarity"] in ("SR", "SSR")]
-    else:
-        lucky_boost = 20 if g.get("lucky_charm", 0) > 0 else 0
-        if g.get("lucky_charm", 0) > 0:
-            g["lucky_charm"] -= 1
-        pool = []
-        for e in GACHA_POOL:
-            w = e["weight"] + lucky_boost if e["rarity"] == "SSR" else e["weight"]
-            pool.append({**e, "weight": w})
-
-    weights = [e["weight"] for e in pool]
-    chosen  = random.choices(pool, weights=weights, k=1)[0]
-
-    if chosen["rarity"] in ("SR", "SSR"):
-        g["pity_sr"] = 0
-    if chosen["rarity"] == "SSR":
-        g["pity_ssr"] = 0
-
-    if chosen["type"] == "coins":
-        user = _add_balance(user, chosen["amount"], f"Gacha: {chosen['label']}")
-        result = {**chosen, "display": chosen["label"]}
-    else:
-        item_id = chosen["item"]
-        user["inventory"][item_id] = user["inventory"].get(item_id, 0) + chosen["amount"]
-        result = {**chosen, "display": SHOP_ITEMS[item_id]["name"]}
+# One alias table per pull state, built once: a pull is a single table draw.
+_GACHA_SAMPLERS = gacha_samplers()
 
-    user = _progress_mission(user, "gacha", 1)
-    return user, result
+# Exact SSR chances per pity state, solved once; shown after every pull.
+_GACHA_ODDS      = GachaOdds(_GACHA_SAMPLERS, GACHA_PITY_LIMIT, GACHA_SSR_PITY)
+GACHA_ODDS_PULLS = (1, 10)
+
+def _ssr_odds(g) -> dict:
+    """{"within": {pulls: chance}, "expected": pulls to the next SSR} from this pity state."""
+    state = (g["pity_sr"], g["pity_ssr"], g["lucky_charm"])
+    return {
+        "within":   {n: _GACHA_ODDS.ssr_within(n, *state) for n in GACHA_ODDS_PULLS},
+        "expected": _GACHA_ODDS.expected_pulls(*state),
+    }
+
+def _draw_pulls(g, count: int) -> list[dict]:
+    """
+    Draw count results in order, moving the pity and lucky-charm counters in
+    g exactly as count separate pulls would. Nothing is paid out here.
+    """
+    samplers = _GACHA_SAMPLERS
+    pity_sr, pity_ssr, charm = g["pity_sr"], g["pity_ssr"], g["lucky_charm"]
+    drawn = []
+    for _ in range(count):
+        pity_sr  += 1
+        pity_ssr += 1
+        if pity_ssr >= GACHA_SSR_PITY:
+            state = "ssr_pity"
+        elif pity_sr >= GACHA_PITY_LIMIT:
+            state = "sr_pity"
+        elif charm > 0:
+            charm -= 1
+            state = "lucky"
+        else:
+            state = "normal"
+        entries, table = samplers[state]
+        chosen = entries[table.sample()]
+        rarity = chosen["rarity"]
+        if rarity == "SSR":
+            pity_sr = pity_ssr = 0
+        elif rarity == "SR":
+            pity_sr = 0
+        drawn.append(chosen)
+    g["pity_sr"], g["pity_ssr"], g["lucky_charm"] = pity_sr, pity_ssr, charm
+    g["total_pulls"] += count
+    return drawn
 
 def gacha_pull(user_id: int, username: str, count: int = 1, use_ticket: bool = False) -> dict:
+    """
+    Pull count times. All results are drawn first, then paid out as one
+    batch: a single balance entry for the coins, one inventory update per
+    item kind and one mission update, however large count is.
+    """
     user = get_user(user_id, username)
 
     if use_ticket:
         tickets = user["inventory"].get("gacha_ticket", 0)
         if tickets < count:
             return {"success": False, "error": f"Tiket tidak cukup! Kamu punya {tickets} tiket."}
-        user["inventory"]["gacha_ticket"] = tickets - count
+        _set_item(user, "gacha_ticket", tickets - count)
     else:
         cost = GACHA_PULL_COST * count
         if user["balance"] < cost:
             return {"success": False, "error": f"WowoCash tidak cukup! Butuh {cost:,}, punya {user['balance']:,}."}
-        user = _add_balance(user, -cost, f"Gacha x{count}")
+        user = _add_balance(user, -cost, "gacha", count)
 
-    results = []
-    for _ in range(count):
-        user, res = _single_pull(user)
-        results.append(res)
+    drawn = _draw_pulls(user["gacha"], count)
+    user["stats"]["gacha_pulls"] += count
+
+    coins, items = 0, {}
+    for e in drawn:
+        if e["type"] == "coins":
+            coins += e["amount"]
+        else:
+            items[e["item"]] = items.get(e["item"], 0) + e["amount"]
+    if coins:
+        user = _add_balance(user, coins, "gacha_prizes", count)
+    for item_id, n in items.items():
+        _set_item(user, item_id, user["inventory"].get(item_id, 0) + n)
+    user = _progress(user, gacha=count)
 
     _save_user(user_id, user)
     return {
         "success":     True,
-        "results":     results,
+        "results":     [
+            {**e, "display": e["label"] if e["type"] == "coins" else SHOP_ITEMS[e["item"]]["name"]}
+            for e in drawn
+        ],
+        "coins":       coins,
+        "items":       items,
         "new_balance": user["balance"],
         "pity_sr":     user["gacha"]["pity_sr"],
         "pity_ssr":    user["gacha"]["pity_ssr"],
+        "ssr_odds":    _ssr_odds(user["gacha"]),
     }
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -392,23 +814,21 @@ def send_transfer(sender_id: int, sender_name: str,
     if amount < 10:
         return {"success": False, "error": "Minimum transfer adalah 10 WowoCash."}
 
-    sender   = get_user(sender_id, sender_name)
-    receiver = get_user(receiver_id, receiver_name)
-
     fee       = max(1, int(amount * TRANSFER_FEE_PCT))
     total_out = amount + fee
 
-    if sender["balance"] < total_out:
-        return {"success": False, "error": f"WowoCash tidak cukup! Butuh {total_out:,} (termasuk fee {fee:,})."}
+    with transaction((sender_id, sender_name), (receiver_id, receiver_name)) as (sender, receiver):
+        if sender["balance"] < total_out:
+            return {"success": False, "error": f"WowoCash tidak cukup! Butuh {total_out:,} (termasuk fee {fee:,})."}
 
-    sender   = _add_balance(sender,   -total_out, f"Transfer ke {receiver_name} (fee {fee})")
-    receiver = _add_balance(receiver,  amount,     f"Diterima dari {sender_name}")
+        sender   = _add_balance(sender,   -total_out, "transfer_out", receiver_name, fee)
+        receiver = _add_balance(receiver,  amount,     "transfer_in", sender_name)
 
-    sender["stats"]["transfers_sent"] += 1
-    sender = _progress_mission(sender, "transfer", 1)
+        sender["stats"]["transfers_sent"] += 1
+        sender = _progress(sender, transfer=1)
 
-    _save_user(sender_id,   sender)
-    _save_user(receiver_id, receiver)
+        _save_user(sender_id,   sender)
+        _save_user(receiver_id, receiver)
 
     return {
         "success":          True,
@@ -438,8 +858,8 @@ def buy_item(user_id: int, username: str, item_id: str, quantity: int = 1) -> di
     if user["balance"] < total_cost:
         return {"success": False, "error": f"WowoCash tidak cukup! Butuh {total_cost:,}, punya {user['balance']:,}."}
 
-    user = _add_balance(user, -total_cost, f"Beli {item['name']} x{quantity}")
-    user["inventory"][item_id] = current + quantity
+    user = _add_balance(user, -total_cost, "buy", item["name"], quantity)
+    _set_item(user, item_id, current + quantity)
     _save_user(user_id, user)
 
     return {"success": True, "item": item, "quantity": quantity, "cost": total_cost, "new_balance": user["balance"]}
@@ -457,24 +877,60 @@ def get_inventory(user_id: int, username: str = "") -> dict:
 # LEADERBOARD & PROFILE
 # ══════════════════════════════════════════════════════════════════════════════
 
-def get_leaderboard(top: int = 10) -> list:
-    data  = _load()
-    users = sorted(data["users"].values(), key=lambda u: u["balance"], reverse=True)
+def get_leaderboard(top: int = 10, offset: int = 0, by: str = "balance") -> list:
+    rows = []
+    for i, (uid, value) in enumerate(_rank_index(by).top(top, offset)):
+        user = _store.summary(uid) or {}   # cold users are listed without being loaded
+        rows.append({"rank": offset + i + 1, "username": user.get("username", ""), "value": value,
+                     "balance": user.get("balance", 0), "lifetime": user.get("lifetime", 0)})
+    return rows
+
+def get_rank(user_id: int, username: str = "", by: str = "balance") -> dict:
+    user  = get_user(user_id, username)
+    index = _rank_index(by)
+    rank  = index.rank(user["id"])
+    if rank is None:
+        # Not stored yet: rank where the default record would land.
+        return {"rank": index.position(user["id"], _board_value(user, by)), "total_users": len(index) + 1}
+    return {"rank": rank, "total_users": len(index)}
+
+def get_balance(user_id: int, username: str = "") -> int:
+    return get_user(user_id, username)["balance"]
+
+def _tx_view(user: dict, limit: int = txlog.TX_KEEP) -> list:
+    """Recent transactions, newest first, with notes rendered."""
     return [
-        {"rank": i + 1, "username": u["username"], "balance": u["balance"], "lifetime": u["lifetime"]}
-        for i, u in enumerate(users[:top])
+        {"amount": amount, "note": TX_NOTES[note].format(*args), "ts": ts}
+        for amount, ts, note, *args in itertools.islice(txlog.ring(user), limit)
     ]
 
+def get_fields(user_id: int, *fields: str, username: str = "") -> dict:
+    """
+    Only the requested parts of a user, for commands that don't need a profile:
+
+        get_fields(uid, "balance", "inventory")
+
+    Fields are top-level record keys (sections, dicts and lists come back as
+    shallow copies) plus "rank" and "total_users" on the balance leaderboard.
+    """
+    user = get_user(user_id, username)
+    out  = {}
+    for field in fields:
+        if field in ("rank", "total_users"):
+            if field not in out:
+                out.update(get_rank(user_id))
+            continue
+        value      = user[field]
+        out[field] = value.copy() if hasattr(value, "copy") else value
+    return out
+
+PROFILE_TXS = 5   # recent transactions shown on /wowo_profile
+
 def get_profile(user_id: int, username: str = "") -> dict:
     user  = get_user(user_id, username)
-    user  = _ensure_missions(user)
-    today = _today()
-    week  = _week()
 
-    daily_done  = sum(1 for m in DAILY_MISSIONS
-                      if user["missions"]["daily"].get(today, {}).get(m["id"], 0) >= m["target"])
-    weekly_done = sum(1 for m in WEEKLY_MISSIONS
-                      if user["missions"]["weekly"].get(week, {}).get(m["id"], 0) >= m["target"])
+    daily_done  = _done_mask(user, "daily", _today()).bit_count()
+    weekly_done = _done_mask(user, "weekly", _week()).bit_count()
 
     badges = []
     if user["inventory"].get("vip_badge", 0):
@@ -487,7 +943,11 @@ def get_profile(user_id: int, username: str = "") -> dict:
         badges.append("🔥 Streak 7")
 
     return {
-        **user,
+        **get_fields(user_id, "id", "username", "balance", "lifetime", "rank", "total_users"),
+        "daily":                 dict(user["daily"]),
+        "stats":                 dict(user["stats"]),
+        "inventory_kinds":       len(user["inventory"]),
+        "transactions":          _tx_view(user, PROFILE_TXS),
         "daily_done":            daily_done,
         "weekly_done":           weekly_done,
         "badges":                badges,
@@ -495,86 +955,178 @@ def get_profile(user_id: int, username: str = "") -> dict:
         "missions_total_weekly": len(WEEKLY_MISSIONS),
     }
 
+# ══════════════════════════════════════════════════════════════════════════════
+# HISTORY
+# ══════════════════════════════════════════════════════════════════════════════
+
+HISTORY_PAGE = 10
+
+def _day_start(day: str, next_day: bool = False) -> int:
+    d = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    if next_day:
+        d += timedelta(days=1)
+    return int(d.timestamp())
+
+def get_history(user_id: int, username: str = "", kind: str | None = None,
+                since: str | None = None, until: str | None = None,
+                before: tuple | None = None, limit: int = HISTORY_PAGE) -> dict:
+    """
+    One page of the user's full ledger, newest first. since/until are
+    YYYY-MM-DD (UTC, both inclusive). Pass the returned "next" as before= to
+    get the following page; it is None on the last page.
+    """
+    try:
+        lo = _day_start(since) if since else None
+        hi = _day_start(until, next_day=True) if until else None
+    except ValueError:
+        return {"success": False, "error": "Format tanggal harus YYYY-MM-DD (contoh: 2025-01-31)."}
+
+    user = get_user(user_id, username)
+    rows = _get_ledger().page(user["id"], limit + 1, kind, lo, hi, before)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "success": True,
+        "entries": [
+            {"amount": amount, "note": TX_NOTES.get(note, "{}").format(*args), "ts": ts, "kind": k}
+            for _, ts, amount, k, note, args in rows
+        ],
+        "next": (rows[-1][1], rows[-1][0]) if more else None,
+    }
+
 # ══════════════════════════════════════════════════════════════════════════════
 # WEREWOLF GAME REWARDS
 # ══════════════════════════════════════════════════════════════════════════════
 
 def award_game_end(players_result: list) -> list:
-    awards = []
-    for pr in players_result:
-        uid   = pr["user_id"]
-        uname = pr["username"]
-        user  = get_user(uid, uname)
-        total = 0
-        breakdown = []
-
-        if pr.get("is_jester_win"):
-            total += WW_REWARDS["jester_win"]
-            breakdown.append(f"🃏 Jester win +{WW_REWARDS['jester_win']}")
-        elif pr.get("won"):
-            total += WW_REWARDS["win"]
-            breakdown.append(f"🏆 Menang +{WW_REWARDS['win']}")
-        else:
-            total += WW_REWARDS["lose"]
-            breakdown.append(f"🎮 Partisipasi +{WW_REWARDS['lose']}")
-
-        if pr.get("survived") and not pr.get("is_jester_win"):
-            total += WW_REWARDS["survive"]
-            breakdown.append(f"💪 Survive +{WW_REWARDS['survive']}")
-
-        if pr.get("is_first_blood"):
-            total += WW_REWARDS["first_blood"]
-            breakdown.append(f"🩸 First Blood +{WW_REWARDS['first_blood']}")
-
-        user = _add_balance(user, total, "Game reward")
-        user["stats"]["games_played"] += 1
-        if pr.get("won") or pr.get("is_jester_win"):
-            user["stats"]["games_won"] += 1
-        if pr.get("survived"):
-            user["stats"]["games_survived"] += 1
-
-        user = _progress_mission(user, "play", 1)
-        if pr.get("won") or pr.get("is_jester_win"):
-            user = _progress_mission(user, "win", 1)
-        if pr.get("survived"):
-            user = _progress_mission(user, "survive", 1)
-
-        _save_user(uid, user)
-        awards.append({
-            "user_id": uid, "username": uname,
-            "awarded": total, "breakdown": breakdown, "balance": user["balance"],
-        })
+    """
+    Settle a whole werewolf game in memory as one transaction: every player's
+    reward, stats and missions, then a single commit, waited for so the
+    rewards are durable once this returns. Each award carries settle_ms,
+    the in-memory time spent on that player, and the commit that made the
+    game durable: commit_ms (first request → on disk) and commit_batch
+    (requests that one write covered: 2 for the game alone, its transaction
+    and the wait, more when other changes shared the write).
+    """
+    awards  = []
+    members = [(pr["user_id"], pr["username"]) for pr in players_result]
+    with transaction(*members) as users:
+        for pr, user in zip(players_result, users):
+            started = time.perf_counter()
+            uid   = pr["user_id"]
+            uname = pr["username"]
+            total = 0
+            breakdown = []
+
+            if pr.get("is_jester_win"):
+                total += WW_REWARDS["jester_win"]
+                breakdown.append(f"🃏 Jester win +{WW_REWARDS['jester_win']}")
+            elif pr.get("won"):
+                total += WW_REWARDS["win"]
+                breakdown.append(f"🏆 Menang +{WW_REWARDS['win']}")
+            else:
+                total += WW_REWARDS["lose"]
+                breakdown.append(f"🎮 Partisipasi +{WW_REWARDS['lose']}")
+
+            if pr.get("survived") and not pr.get("is_jester_win"):
+                total += WW_REWARDS["survive"]
+                breakdown.append(f"💪 Survive +{WW_REWARDS['survive']}")
+
+            if pr.get("is_first_blood"):
+                total += WW_REWARDS["first_blood"]
+                breakdown.append(f"🩸 First Blood +{WW_REWARDS['first_blood']}")
+
+            user = _add_balance(user, total, "game")
+            user["stats"]["games_played"] += 1
+            if pr.get("won") or pr.get("is_jester_win"):
+                user["stats"]["games_won"] += 1
+            if pr.get("survived"):
+                user["stats"]["games_survived"] += 1
+
+            user = _progress(
+                user,
+                play    = 1,
+                win     = 1 if pr.get("won") or pr.get("is_jester_win") else 0,
+                survive = 1 if pr.get("survived") else 0,
+            )
+
+            _save_user(uid, user)
+            awards.append({
+                "user_id": uid, "username": uname,
+                "awarded": total, "breakdown": breakdown, "balance": user["balance"],
+                "settle_ms": round((time.perf_counter() - started) * 1000, 3),
+            })
+    committed = _store.commit()
+    for award in awards:
+        award["commit_ms"]    = committed["latency_ms"]
+        award["commit_batch"] = committed["batch"]
     return awards
 
 def progress_vote(user_id: int, username: str):
     user = get_user(user_id, username)
     user["stats"]["votes_cast"] += 1
-    user = _progress_mission(user, "vote", 1)
+    user = _progress(user, vote=1)
     _save_user(user_id, user)
 
 # ══════════════════════════════════════════════════════════════════════════════
 # COOLDOWN HELPERS
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Cooldowns are stored on the user as the last-use epoch second ("c" journal
+# records) and indexed in memory by when they run out.
+_cooldowns       = CooldownIndex()
+_cooldowns_ready = False
+
+def _cooldown_ts(last) -> int:
+    """Last use as epoch seconds. Older records hold a naive UTC ISO string."""
+    if isinstance(last, str):
+        if last.isdigit():
+            return int(last)
+        return int(datetime.fromisoformat(last).replace(tzinfo=timezone.utc).timestamp())
+    return int(last)
+
+def _cooldown_index() -> CooldownIndex:
+    global _cooldowns_ready
+    if not _cooldowns_ready:
+        with _store.lock:
+            if not _cooldowns_ready:
+                now = _now_ts()
+                _cooldowns.build(
+                    (uid, key, ready_at)
+                    for uid, u in list(_store.users.items())
+                    for key, last in u.get("cooldowns", {}).items()
+                    if (ready_at := _cooldown_ts(last) + COOLDOWNS.get(key, 3600)) > now
+                )
+                _cooldowns_ready = True
+    return _cooldowns
+
 def _get_cooldown_secs(user: dict, key: str) -> int:
     """Returns remaining cooldown in seconds, 0 if ready."""
-    cd = user.get("cooldowns", {}).get(key)
-    if not cd:
-        return 0
-    from datetime import datetime
-    last = datetime.fromisoformat(cd)
-    now  = datetime.utcnow()
-    limits = {"work": COOLDOWN_WORK, "rob": COOLDOWN_ROB, "hourly": COOLDOWN_HOURLY}
-    limit  = limits.get(key, 3600)
-    diff   = (now - last).total_seconds()
-    return max(0, int(limit - diff))
+    return max(0, _cooldown_index().ready_at(user["id"], key) - _now_ts())
 
 def _set_cooldown(user: dict, key: str) -> dict:
-    if "cooldowns" not in user:
-        user["cooldowns"] = {}
-    user["cooldowns"][key] = datetime.utcnow().isoformat()
+    _ensure_stored(user)
+    now = _now_ts()
+    user.setdefault("cooldowns", {})[key] = now
+    _store.log("c", user["id"], key, now)
+    _cooldown_index().set(user["id"], key, now + COOLDOWNS[key])
     return user
 
+def get_cooldowns(user_id: int) -> dict:
+    """Seconds left on each of the user's timers ({key: secs}, 0 = ready)."""
+    timers = _cooldown_index().timers(str(user_id))
+    now    = _now_ts()
+    return {key: max(0, timers.get(key, 0) - now) for key in COOLDOWNS}
+
+def pop_ready_cooldowns() -> dict:
+    """
+    Timers that ran out since the last call, straight off the expiry heap:
+    {"ready": [(user_id, key), ...], "next": epoch second of the next expiry or None}.
+    """
+    index = _cooldown_index()
+    ready = index.pop_expired(_now_ts())
+    return {"ready": [(int(uid), key) for uid, key in ready], "next": index.next_expiry()}
+
 def fmt_cooldown(secs: int) -> str:
     if secs <= 0:
         return "Siap!"
@@ -605,8 +1157,8 @@ def do_work(user_id: int, username: str) -> dict:
     total  = earned + bonus
 
     user = _set_cooldown(user, "work")
-    user = _add_balance(user, total, f"Kerja sebagai {job['name']}")
-    user = _progress_mission(user, "work", 1)
+    user = _add_balance(user, total, "work", job["name"])
+    user = _progress(user, work=1)
     _save_user(user_id, user)
 
     return {
@@ -634,7 +1186,7 @@ def claim_hourly(user_id: int, username: str) -> dict:
     total  = base + bonus
 
     user = _set_cooldown(user, "hourly")
-    user = _add_balance(user, total, "Hourly reward")
+    user = _add_balance(user, total, "hourly")
     _save_user(user_id, user)
     return {"success": True, "total": total, "balance": user["balance"], "streak_bonus": bonus}
 
@@ -646,38 +1198,36 @@ def do_rob(robber_id: int, robber_name: str, victim_id: int, victim_name: str) -
     if robber_id == victim_id:
         return {"success": False, "error": "Tidak bisa merampok diri sendiri!"}
 
-    robber = get_user(robber_id, robber_name)
-    victim = get_user(victim_id, victim_name)
-
-    cd = _get_cooldown_secs(robber, "rob")
-    if cd > 0:
-        return {"success": False, "cooldown": cd, "error": f"Polisi masih mengejarmu! Tunggu **{fmt_cooldown(cd)}**."}
-
-    if victim["balance"] < 50:
-        return {"success": False, "error": f"**{victim_name}** tidak punya cukup uang untuk dirampok (min. 50 💰)."}
-
-    # 45% success chance
-    success = random.random() < 0.45
-    robber  = _set_cooldown(robber, "rob")
-
-    if success:
-        steal = random.randint(
-            min(50, victim["balance"] // 4),
-            min(300, victim["balance"] // 3),
-        )
-        robber = _add_balance(robber, steal,  f"Merampok {victim_name}")
-        victim = _add_balance(victim, -steal, f"Dirampok oleh {robber_name}")
-        robber = _progress_mission(robber, "rob", 1)
-        _save_user(robber_id, robber)
-        _save_user(victim_id, victim)
-        return {"success": True, "robbed": True, "amount": steal,
-                "robber_balance": robber["balance"], "victim_balance": victim["balance"]}
-    else:
-        # Caught — pay fine
-        fine = random.randint(30, 100)
-        robber = _add_balance(robber, -fine, f"Ketahuan merampok {victim_name} (denda)")
-        _save_user(robber_id, robber)
-        return {"success": True, "robbed": False, "fine": fine, "robber_balance": robber["balance"]}
+    with transaction((robber_id, robber_name), (victim_id, victim_name)) as (robber, victim):
+        cd = _get_cooldown_secs(robber, "rob")
+        if cd > 0:
+            return {"success": False, "cooldown": cd, "error": f"Polisi masih mengejarmu! Tunggu **{fmt_cooldown(cd)}**."}
+
+        if victim["balance"] < 50:
+            return {"success": False, "error": f"**{victim_name}** tidak punya cukup uang untuk dirampok (min. 50 💰)."}
+
+        # 45% success chance
+        success = random.random() < 0.45
+        robber  = _set_cooldown(robber, "rob")
+
+        if success:
+            steal = random.randint(
+                min(50, victim["balance"] // 4),
+                min(300, victim["balance"] // 3),
+            )
+            robber = _add_balance(robber, steal,  "rob", victim_name)
+            victim = _add_balance(victim, -steal, "robbed", robber_name)
+            robber = _progress(robber, rob=1)
+            _save_user(robber_id, robber)
+            _save_user(victim_id, victim)
+            return {"success": True, "robbed": True, "amount": steal,
+                    "robber_balance": robber["balance"], "victim_balance": victim["balance"]}
+        else:
+            # Caught — pay fine
+            fine = random.randint(30, 100)
+            robber = _add_balance(robber, -fine, "rob_fine", victim_name)
+            _save_user(robber_id, robber)
+            return {"success": True, "robbed": False, "fine": fine, "robber_balance": robber["balance"]}
 
 # ══════════════════════════════════════════════════════════════════════════════
 # CASINO GAMES
@@ -686,6 +1236,12 @@ def do_rob(robber_id: int, robber_name: str, victim_id: int, victim_name: str) -
 MIN_BET = 10
 MAX_BET = 5000
 
+# Payout rules, shared with economy.casino_rtp so a change here is re-checked there.
+COINFLIP_PAYOUT   = 0.95   # net win on a correct call, times the bet (2.5% house edge)
+DICE_PAYOUT       = 4.8    # net win on a correct 1–6 guess, times the bet (3.3% house edge)
+BJ_NATURAL_PAYOUT = 1.5    # net win on a two-card 21, times the bet
+BJ_DEALER_STANDS  = 17     # dealer draws below this (stands on soft 17)
+
 def _validate_bet(user: dict, bet: int) -> str | None:
     if bet < MIN_BET:
         return f"Minimum bet adalah {MIN_BET:,} 💰."
@@ -706,9 +1262,9 @@ def casino_coinflip(user_id: int, username: str, bet: int, choice: str) -> dict:
 
     result  = random.choice(["heads", "tails"])
     won     = result == choice
-    delta   = bet if won else -bet
-    user    = _add_balance(user, delta, f"Coin flip: {'menang' if won else 'kalah'} {bet:,}")
-    user    = _progress_mission(user, "casino", 1)
+    delta   = int(bet * COINFLIP_PAYOUT) if won else -bet
+    user    = _add_balance(user, delta, "coinflip", "menang" if won else "kalah", bet)
+    user    = _progress(user, casino=1)
     _save_user(user_id, user)
 
     return {
@@ -730,9 +1286,9 @@ def casino_dice(user_id: int, username: str, bet: int, guess: int) -> dict:
 
     roll = random.randint(1, 6)
     won  = roll == guess
-    delta = bet * 5 if won else -bet
-    user  = _add_balance(user, delta, f"Dice: {'menang' if won else 'kalah'} (roll {roll})")
-    user  = _progress_mission(user, "casino", 1)
+    delta = int(bet * DICE_PAYOUT) if won else -bet
+    user  = _add_balance(user, delta, "dice", "menang" if won else "kalah", roll)
+    user  = _progress(user, casino=1)
     _save_user(user_id, user)
 
     return {
@@ -743,6 +1299,13 @@ def casino_dice(user_id: int, username: str, bet: int, guess: int) -> dict:
 
 # ── Slot Machine ──────────────────────────────────────────────────────────────
 
+def _slot_multiplier(reels) -> float:
+    mult = SLOT_PAYOUTS.get(tuple(reels), 0)
+    # Two cherry bonus
+    if mult == 0 and list(reels).count("🍒") == 2:
+        mult = 0.5
+    return mult
+
 def casino_slots(user_id: int, username: str, bet: int) -> dict:
     user = get_user(user_id, username)
     err  = _validate_bet(user, bet)
@@ -751,17 +1314,12 @@ def casino_slots(user_id: int, username: str, bet: int) -> dict:
 
     reels  = random.choices(SLOT_SYMBOLS, weights=SLOT_WEIGHTS, k=3)
     combo  = tuple(reels)
-    mult   = SLOT_PAYOUTS.get(combo, 0)
-
-    # Two cherry bonus
-    if mult == 0 and reels.count("🍒") == 2:
-        mult = 0.5
+    mult   = _slot_multiplier(reels)
 
     winnings = int(bet * mult)
     delta    = winnings - bet
-    note     = f"Slots {'win' if delta > 0 else 'lose'} x{mult}"
-    user     = _add_balance(user, delta, note)
-    user     = _progress_mission(user, "casino", 1)
+    user     = _add_balance(user, delta, "slots", "win" if delta > 0 else "lose", mult)
+    user     = _progress(user, casino=1)
     _save_user(user_id, user)
 
     return {
@@ -774,6 +1332,9 @@ def casino_slots(user_id: int, username: str, bet: int) -> dict:
 
 # ── Number Guess ──────────────────────────────────────────────────────────────
 
+def _number_multiplier(max_num: int) -> int:
+    return int(max_num * 0.9)
+
 def casino_number(user_id: int, username: str, bet: int, guess: int, max_num: int = 10) -> dict:
     """Guess number 1-max_num. Payout = max_num * 0.9x bet."""
     user = get_user(user_id, username)
@@ -785,10 +1346,10 @@ def casino_number(user_id: int, username: str, bet: int, guess: int, max_num: in
 
     number = random.randint(1, max_num)
     won    = number == guess
-    mult   = int(max_num * 0.9) if won else 0
+    mult   = _number_multiplier(max_num) if won else 0
     delta  = bet * mult - bet if won else -bet
-    user   = _add_balance(user, delta, f"Number guess {'win' if won else 'lose'}")
-    user   = _progress_mission(user, "casino", 1)
+    user   = _add_balance(user, delta, "number", "win" if won else "lose")
+    user   = _progress(user, casino=1)
     _save_user(user_id, user)
 
     return {
@@ -827,7 +1388,7 @@ def blackjack_deal(user_id: int, username: str, bet: int) -> dict:
     dealer = [deck.pop(), deck.pop()]
 
     # Deduct bet immediately
-    user = _add_balance(user, -bet, f"Blackjack bet {bet:,}")
+    user = _add_balance(user, -bet, "bj_bet", bet)
     _save_user(user_id, user)
 
     state = {
@@ -858,7 +1419,7 @@ def blackjack_resolve(state: dict, action: str) -> dict:
         if pval > 21:
             # Bust — money already deducted
             user = get_user(uid, uname)
-            user = _progress_mission(user, "casino", 1)
+            user = _progress(user, casino=1)
             _save_user(uid, user)
             return {
                 "success": True, "done": True,
@@ -876,23 +1437,23 @@ def blackjack_resolve(state: dict, action: str) -> dict:
 
     # Stand — dealer plays
     dval = _bj_hand_value(dealer)
-    while dval < 17:
+    while dval < BJ_DEALER_STANDS:
         dealer.append(deck.pop())
         dval = _bj_hand_value(dealer)
 
     pval = _bj_hand_value(player)
     user = get_user(uid, uname)
-    user = _progress_mission(user, "casino", 1)
+    user = _progress(user, casino=1)
 
     if dval > 21 or pval > dval:
         result = "win"
-        mult   = 1.5 if pval == 21 and len(player) == 2 else 1
+        mult   = BJ_NATURAL_PAYOUT if pval == 21 and len(player) == 2 else 1
         delta  = int(bet * (1 + mult))
-        user   = _add_balance(user, delta, f"Blackjack win x{1+mult}")
+        user   = _add_balance(user, delta, "bj_win", 1 + mult)
     elif pval == dval:
         result = "push"
         delta  = bet
-        user   = _add_balance(user, delta, "Blackjack push (refund)")
+        user   = _add_balance(user, delta, "bj_push")
     else:
         result = "lose"
         delta  = -bet  # already deducted, just for display
@@ -904,4 +1465,14 @@ def blackjack_resolve(state: dict, action: str) -> dict:
         "player_val": pval, "dealer_val": dval,
         "delta": delta if result != "lose" else -bet,
         "balance": user["balance"],
-    }
\ No newline at end of file
+    }
+# ══════════════════════════════════════════════════════════════════════════════
+# RUSSIAN ROULETTE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def roulette_payout(user_id: int, username: str, pot: int) -> dict:
+    with transaction((user_id, username)) as (user,):
+        user = _add_balance(user, pot, "rr_win", pot)
+        user = _progress(user, casino=1)
+        _save_user(user_id, user)
+    return {"success": True, "balance": user["balance"]}
@@ -229,6 +229,12 @@ class WerewolfGame:
         self.votes:        dict[discord.Member, discord.Member] = {}
         self.vote_message: discord.Message | None               = None
 
+        # ── Shop items (chosen with /ww_use, armed at game start) ──────────────
+        self.item_choices: dict[discord.Member, set[str]] = {}   # lobby picks, not yet checked
+        self.shields:      set[discord.Member] = set()   # survive one wolf attack
+        self.double_votes: set[discord.Member] = set()   # next day vote counts twice
+        self.items_used:   list[tuple[discord.Member, str]] = []   # took effect; the cog charges them
+
         # ── Internal tracking ─────────────────────────────────────────────────
         self._wolf_votes:    dict[discord.Member, discord.Member] = {}
         self._night_acted:   set[discord.Member]                  = set()
@@ -249,6 +255,16 @@ class WerewolfGame:
         if member not in self.players:
             return False
         self.players.remove(member)
+        self.item_choices.pop(member, None)
+        return True
+
+    def toggle_item(self, member: discord.Member, item_id: str) -> bool:
+        """Pick or drop an item for this game. Returns True if it is now picked."""
+        picked = self.item_choices.setdefault(member, set())
+        if item_id in picked:
+            picked.discard(item_id)
+            return False
+        picked.add(item_id)
         return True
 
     # ── Helpers ───────────────────────────────────────────────────────────────
@@ -358,11 +374,12 @@ class WerewolfGame:
           3. Bodyguard intercept — BG dies instead of target
           4. Doctor save — cancels kill
           5. Witch heal — cancels kill (if already set via WitchView)
-          6. Witch poison — kills separate target
-          7. Apply all deaths
+          6. Shield item — cancels kill, used up
+          7. Witch poison — kills separate target
+          8. Apply all deaths
 
         Returns dict:
-          wolf_target, killed, saved, poisoned,
+          wolf_target, killed, saved, poisoned, shielded (Member|None),
           cursed_turned (Member|None), bodyguard_died (Member|None)
         """
         wolf_target = self.tally_wolf_vote()
@@ -373,6 +390,7 @@ class WerewolfGame:
         cursed_turned    = None
         bodyguard_died   = None
         poisoned         = None
+        shielded         = None
 
         if wolf_target and wolf_target in self.alive:
             target_role = self.roles[wolf_target]
@@ -398,6 +416,11 @@ class WerewolfGame:
                 # ── Doctor save ───────────────────────────────────────────────
                 elif wolf_target == self.doctor_save and wolf_target in self.alive:
                     saved = True
+                # ── Shield item ───────────────────────────────────────────────
+                elif wolf_target in self.shields:
+                    self.shields.discard(wolf_target)
+                    self.items_used.append((wolf_target, "shield"))
+                    shielded = wolf_target
                 # ── Normal kill ───────────────────────────────────────────────
                 else:
                     killed = wolf_target
@@ -418,6 +441,7 @@ class WerewolfGame:
             "killed":         killed,
             "saved":          saved,
             "poisoned":       poisoned,
+            "shielded":       shielded,
             "cursed_turned":  cursed_turned,
             "bodyguard_died": bodyguard_died,
         }
@@ -447,13 +471,19 @@ class WerewolfGame:
         self.votes[voter] = target
         return True
 
+    def vote_counts(self):
+        """Counter of target → votes, with Double Vote holders counting twice."""
+        from collections import Counter
+        c = Counter()
+        for voter, target in self.votes.items():
+            c[target] += 2 if voter in self.double_votes else 1
+        return c
+
     def tally_votes(self) -> discord.Member | None:
         """Most-voted player, or None on tie."""
         if not self.votes:
             return None
-        from collections import Counter
-        c   = Counter(self.votes.values())
-        top = c.most_common(2)
+        top = self.vote_counts().most_common(2)
         if len(top) == 1:
             return top[0][0]
         if top[0][1] > top[1][1]:
@@ -467,6 +497,9 @@ class WerewolfGame:
         Returns eliminated member or None.
         """
         target = self.tally_votes()
+        for voter in self.double_votes & self.votes.keys():   # used up once cast
+            self.items_used.append((voter, "double_vote"))
+        self.double_votes -= self.votes.keys()
         self.votes = {}
         if target:
             if self.roles.get(target) == Role.JESTER:
@@ -0,0 +1,20 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from economy import gacha_sim
+from economy import wowocash as eco
+
+
+def test_pulls_to_ssr_matches_exact_odds():
+    # Many players with short runs, so most of them end on an open wait:
+    # the estimate has to account for those to match the exact chain.
+    report = gacha_sim.simulate(users=5000, pulls=400, seed=1)["pulls_to_ssr"]
+    odds   = eco._GACHA_ODDS
+    cdf    = np.cumsum(report["pmf"])
+
+    assert report["censored"] > 0
+    assert report["mean"] == pytest.approx(odds.expected_pulls(0, 0), abs=1.0)
+    for pulls in (1, 10, 35, 60, 99):
+        assert cdf[pulls] == pytest.approx(odds.ssr_within(pulls, 0, 0), abs=0.02)
+    assert cdf[eco.GACHA_SSR_PITY] == pytest.approx(1.0)